@@ -2,17 +2,28 @@
 Constrained chat agent for valuation runs using LangGraph
 """
 
+import copy
 import json
+import re
 import asyncio
-from typing import Dict, Any, List, Optional, Annotated
+import functools
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Annotated, Tuple
 from datetime import datetime
-import requests
+import httpx
 from dataclasses import dataclass
 from enum import Enum
 
 # LangGraph imports (simplified implementation)
 from typing import TypedDict, Literal
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 class ChatState(TypedDict):
     """State for the chat agent"""
@@ -35,15 +46,111 @@ class ToolType(Enum):
 @dataclass
 class ToolCall:
     """Tool call definition"""
+    __slots__ = ("name", "parameters", "description")
+    
     name: str
     parameters: Dict[str, Any]
     description: str
 
 
+RUNS_API_BASE_URL = "http://127.0.0.1:9000"
+EXPLAIN_API_BASE_URL = "http://127.0.0.1:8000"
+
+# Abstain reasons: a policy refusal is always reported to the user, while an
+# unrecognized clause is dropped when another clause asked for a tool
+POLICY_ABSTAIN_REASON = "Request involves pricing/calculation outside allowed scope"
+UNRECOGNIZED_ABSTAIN_REASON = "Request not recognized or outside allowed scope"
+
+# Runs in these states rarely change, so their status is cached longer
+TERMINAL_RUN_STATUSES = frozenset({"succeeded", "completed", "failed", "cancelled"})
+
+
+class _TTLCache:
+    """Bounded LRU cache whose entries expire after ``ttl`` seconds (never if None)
+    
+    Values are deep-copied in and out, so callers can modify what they get
+    without changing the cached entry.
+    """
+    
+    def __init__(self, maxsize: int, ttl: Optional[float]):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return copy.deepcopy(value)
+    
+    def set(self, key: str, value: Any) -> None:
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        self._data[key] = (expires_at, copy.deepcopy(value))
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+ABSTAIN_KEYWORDS = (
+    "price", "calculate", "compute", "value", "barrier", "option",
+    "swaption", "cap", "floor", "exotic", "derivative", "invent",
+    "create", "generate", "make up", "fabricate", "estimate"
+)
+
+FORBIDDEN_PATTERNS = (
+    "price a", "calculate a", "value a", "compute a",
+    "invent", "make up", "fabricate", "estimate"
+)
+
+# A term containing another term ("price a" contains "price") can never
+# change the outcome of an any-match, so only the minimal terms are scanned
+_ALL_ABSTAIN_TERMS = tuple(dict.fromkeys(ABSTAIN_KEYWORDS + FORBIDDEN_PATTERNS))
+ABSTAIN_TERMS = tuple(
+    term for term in _ALL_ABSTAIN_TERMS
+    if not any(other != term and other in term for other in _ALL_ABSTAIN_TERMS)
+)
+
+
+def _build_abstain_automaton(terms: Tuple[str, ...]) -> Optional[Any]:
+    """Build an Aho-Corasick automaton over the terms, if pyahocorasick is installed"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
 class ConstrainedChatAgent:
     """Constrained chat agent that can only perform specific actions"""
     
+    abstain_keywords = ABSTAIN_KEYWORDS
+    forbidden_patterns = FORBIDDEN_PATTERNS
+    
+    # Match every abstain term in a single scan of the message: an
+    # Aho-Corasick automaton when available, a regex alternation otherwise.
+    # Both are shared by all agents.
+    _abstain_automaton = _build_abstain_automaton(ABSTAIN_TERMS)
+    _abstain_re = re.compile("|".join(map(re.escape, ABSTAIN_TERMS)))
+    
     def __init__(self):
+        # HTTP clients are created lazily on first use so the agent can be
+        # constructed at import time, outside of a running event loop.
+        self._runs_http: Optional[httpx.AsyncClient] = None
+        self._explain_http: Optional[httpx.AsyncClient] = None
+        
+        # Short-lived response caches for the read-only tools
+        self._status_cache = _TTLCache(maxsize=1024, ttl=5)
+        # Finite, so a re-run or corrected run is eventually refreshed
+        self._terminal_status_cache = _TTLCache(maxsize=1024, ttl=300)
+        self._explain_cache = _TTLCache(maxsize=1024, ttl=300)
+        
         self.allowed_tools = {
             "get_run_status": {
                 "description": "Get the status and details of a valuation run",
@@ -59,59 +166,111 @@ class ConstrainedChatAgent:
             }
         }
         
-        self.abstain_keywords = [
-            "price", "calculate", "compute", "value", "barrier", "option", 
-            "swaption", "cap", "floor", "exotic", "derivative", "invent",
-            "create", "generate", "make up", "fabricate", "estimate"
-        ]
+        # Keyword -> tool routing, resolved with one scan of the message.
+        # When several intents match, the lowest priority value wins.
+        self._intent_keywords = {
+            "sensitivity": "run_sensitivity", "shock": "run_sensitivity",
+            "bump": "run_sensitivity", "parallel": "run_sensitivity",
+            "twist": "run_sensitivity",
+            "explain": "explain_run", "why": "explain_run", "reason": "explain_run",
+            "rationale": "explain_run", "methodology": "explain_run",
+            "status": "get_run_status", "state": "get_run_status",
+            "progress": "get_run_status", "result": "get_run_status",
+            "details": "get_run_status"
+        }
+        self._intent_priority = {"run_sensitivity": 0, "explain_run": 1, "get_run_status": 2}
+        self._intent_re = re.compile("|".join(map(re.escape, self._intent_keywords)))
+        self._shock_re = re.compile(r"([+-])\s*(\d+(?:\.\d+)?)\s*bp")
+        # Compound prompts ("status and explain") are split into clauses
+        self._clause_re = re.compile(r"\band\b|;")
+        
+        # Parsing is deterministic, so repeated prompts ("status", "explain")
+        # are answered from a bounded per-agent LRU cache
+        self._parse_tool_request_cached = functools.lru_cache(maxsize=1024)(
+            self._parse_tool_request
+        )
     
     def should_abstain(self, message: str) -> bool:
         """Check if the message should trigger abstention"""
         message_lower = message.lower()
         
-        # Check for abstain keywords
-        for keyword in self.abstain_keywords:
-            if keyword in message_lower:
-                return True
-        
-        # Check for specific forbidden patterns
-        forbidden_patterns = [
-            "price a", "calculate a", "value a", "compute a",
-            "invent", "make up", "fabricate", "estimate"
-        ]
-        
-        for pattern in forbidden_patterns:
-            if pattern in message_lower:
-                return True
+        if self._abstain_automaton is not None:
+            return next(self._abstain_automaton.iter(message_lower), None) is not None
         
-        return False
+        return self._abstain_re.search(message_lower) is not None
+    
+    def _match_intent(self, message_lower: str) -> Optional[str]:
+        """Return the highest-priority tool intent mentioned in the message"""
+        best = None
+        for match in self._intent_re.finditer(message_lower):
+            intent = self._intent_keywords[match.group(0)]
+            if best is None or self._intent_priority[intent] < self._intent_priority[best]:
+                best = intent
+                if self._intent_priority[intent] == 0:
+                    break
+        return best
     
     def parse_tool_request(self, message: str, run_id: str) -> Optional[ToolCall]:
         """Parse user message and determine appropriate tool call"""
-        message_lower = message.lower()
+        return self._parse_normalized(" ".join(message.lower().split()), run_id)
+    
+    def parse_tool_requests(self, message: str, run_id: str) -> List[ToolCall]:
+        """Parse a possibly compound message into one tool call per clause"""
+        message_lower = " ".join(message.lower().split())
+        clauses = [
+            clause.strip() for clause in self._clause_re.split(message_lower)
+            if clause.strip()
+        ] or [message_lower]
+        
+        tool_calls: List[ToolCall] = []
+        for clause in clauses:
+            tool_call = self._parse_normalized(clause, run_id)
+            if tool_call not in tool_calls:
+                tool_calls.append(tool_call)
         
+        # Unrecognized clauses only matter when nothing else was asked for;
+        # policy refusals are kept so they are reported next to other results
+        recognized = [
+            tc for tc in tool_calls
+            if tc.name != "abstain" or tc.parameters["reason"] != UNRECOGNIZED_ABSTAIN_REASON
+        ]
+        return recognized or tool_calls[:1]
+    
+    def _parse_normalized(self, message_lower: str, run_id: str) -> Optional[ToolCall]:
+        """Parse a normalized message through the cache, returning a private copy"""
+        # Cached calls are shared, so callers get their own parameters dict
+        tool_call = self._parse_tool_request_cached(message_lower, run_id)
+        if tool_call is None:
+            return None
+        return ToolCall(
+            name=tool_call.name,
+            parameters=dict(tool_call.parameters),
+            description=tool_call.description
+        )
+    
+    def _parse_tool_request(self, message_lower: str, run_id: str) -> Optional[ToolCall]:
+        """Parse a normalized (lowercased, whitespace-collapsed) message"""
         # Check for abstention first
-        if self.should_abstain(message):
+        if self.should_abstain(message_lower):
             return ToolCall(
                 name="abstain",
-                parameters={"reason": "Request involves pricing/calculation outside allowed scope"},
+                parameters={"reason": POLICY_ABSTAIN_REASON},
                 description="Abstain from unauthorized request"
             )
         
+        intent = self._match_intent(message_lower)
+        
         # Parse sensitivity requests
-        if any(word in message_lower for word in ["sensitivity", "shock", "bump", "parallel", "twist"]):
+        if intent == "run_sensitivity":
             shock_type = "parallel"
             shock_value = 1.0  # Default 1bp
             
             if "parallel" in message_lower:
-                if "+1bp" in message_lower or "+1 bp" in message_lower:
-                    shock_value = 1.0
-                elif "-1bp" in message_lower or "-1 bp" in message_lower:
-                    shock_value = -1.0
-                elif "+10bp" in message_lower or "+10 bp" in message_lower:
-                    shock_value = 10.0
-                elif "-10bp" in message_lower or "-10 bp" in message_lower:
-                    shock_value = -10.0
+                shock = self._shock_re.search(message_lower)
+                if shock:
+                    shock_value = float(shock.group(2))
+                    if shock.group(1) == "-":
+                        shock_value = -shock_value
             
             return ToolCall(
                 name="run_sensitivity",
@@ -124,7 +283,7 @@ class ConstrainedChatAgent:
             )
         
         # Parse explanation requests
-        if any(word in message_lower for word in ["explain", "why", "reason", "rationale", "methodology"]):
+        if intent == "explain_run":
             return ToolCall(
                 name="explain_run",
                 parameters={"run_id": run_id},
@@ -132,7 +291,7 @@ class ConstrainedChatAgent:
             )
         
         # Parse status requests
-        if any(word in message_lower for word in ["status", "state", "progress", "result", "details"]):
+        if intent == "get_run_status":
             return ToolCall(
                 name="get_run_status",
                 parameters={"run_id": run_id},
@@ -142,7 +301,7 @@ class ConstrainedChatAgent:
         # Default to abstention if unclear
         return ToolCall(
             name="abstain",
-            parameters={"reason": "Request not recognized or outside allowed scope"},
+            parameters={"reason": UNRECOGNIZED_ABSTAIN_REASON},
             description="Abstain from unclear request"
         )
     
@@ -166,13 +325,47 @@ class ConstrainedChatAgent:
         except Exception as e:
             return {"error": f"Tool execution failed: {str(e)}"}
     
+    def _client(self, base_url: str) -> httpx.AsyncClient:
+        """Return a pooled keep-alive client for the given backend"""
+        return httpx.AsyncClient(
+            base_url=base_url,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=64)
+        )
+    
+    @property
+    def runs_http(self) -> httpx.AsyncClient:
+        """Shared client for the runs API"""
+        if self._runs_http is None or self._runs_http.is_closed:
+            self._runs_http = self._client(RUNS_API_BASE_URL)
+        return self._runs_http
+    
+    @property
+    def explain_http(self) -> httpx.AsyncClient:
+        """Shared client for the explanation (RAG) API"""
+        if self._explain_http is None or self._explain_http.is_closed:
+            self._explain_http = self._client(EXPLAIN_API_BASE_URL)
+        return self._explain_http
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients"""
+        for client in (self._runs_http, self._explain_http):
+            if client is not None:
+                await client.aclose()
+        self._runs_http = None
+        self._explain_http = None
+    
     async def _get_run_status(self, run_id: str) -> Dict[str, Any]:
         """Get run status from API"""
+        cached = self._terminal_status_cache.get(run_id) or self._status_cache.get(run_id)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(f"http://127.0.0.1:9000/runs/{run_id}")
+            response = await self.runs_http.get(f"/runs/{run_id}")
             if response.status_code == 200:
                 run_data = response.json()
-                return {
+                result = {
                     "success": True,
                     "data": {
                         "run_id": run_data.get("id"),
@@ -184,6 +377,11 @@ class ConstrainedChatAgent:
                         "instrument_type": "IRS" if "payFixed" in run_data.get("request", {}).get("spec", {}) else "CCS"
                     }
                 }
+                if result["data"]["status"] in TERMINAL_RUN_STATUSES:
+                    self._terminal_status_cache.set(run_id, result)
+                else:
+                    self._status_cache.set(run_id, result)
+                return result
             else:
                 return {"success": False, "error": f"Run not found: {response.status_code}"}
         except Exception as e:
@@ -198,8 +396,8 @@ class ConstrainedChatAgent:
                 "shock_value": shock_value
             }
             
-            response = requests.post(
-                f"http://127.0.0.1:9000/runs/{run_id}/sensitivities",
+            response = await self.runs_http.post(
+                f"/runs/{run_id}/sensitivities",
                 json=sensitivity_request
             )
             
@@ -222,11 +420,15 @@ class ConstrainedChatAgent:
     
     async def _explain_run(self, run_id: str) -> Dict[str, Any]:
         """Get explanation using RAG"""
+        cached = self._explain_cache.get(run_id)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(f"http://127.0.0.1:8000/explain/{run_id}")
+            response = await self.explain_http.get(f"/explain/{run_id}")
             if response.status_code == 200:
                 explanation_data = response.json()
-                return {
+                result = {
                     "success": True,
                     "data": {
                         "explanation": explanation_data.get("explanation", ""),
@@ -236,6 +438,8 @@ class ConstrainedChatAgent:
                         "generated_at": explanation_data.get("generated_at")
                     }
                 }
+                self._explain_cache.set(run_id, result)
+                return result
             else:
                 return {"success": False, "error": f"Explanation failed: {response.status_code}"}
         except Exception as e:
@@ -265,75 +469,88 @@ class ConstrainedChatAgent:
             approach = data.get("approach", [])
             instrument_type = data.get("instrument_type", "Unknown")
             
-            response = f"**Run Status:** {status}\n"
-            response += f"**Instrument Type:** {instrument_type}\n"
-            response += f"**Approach:** {', '.join(approach)}\n"
+            parts = [
+                f"**Run Status:** {status}\n",
+                f"**Instrument Type:** {instrument_type}\n",
+                f"**Approach:** {', '.join(approach)}\n"
+            ]
             
             if data.get("error_message"):
-                response += f"**Error:** {data['error_message']}\n"
+                parts.append(f"**Error:** {data['error_message']}\n")
             
-            return response
+            return "".join(parts)
         
         elif tool_call.name == "run_sensitivity":
             shock_type = data.get("shock_type", "unknown")
             shock_value = data.get("shock_value", 0)
             pv_delta = data.get("pv_delta", 0)
             
-            response = f"**Sensitivity Analysis Complete**\n"
-            response += f"**Shock:** {shock_type} {shock_value:+.1f}bp\n"
-            response += f"**PV Delta:** {pv_delta:,.2f}\n"
+            parts = [
+                "**Sensitivity Analysis Complete**\n",
+                f"**Shock:** {shock_type} {shock_value:+.1f}bp\n",
+                f"**PV Delta:** {pv_delta:,.2f}\n"
+            ]
             
             components = data.get("components", {})
             if components:
-                response += "**Component Changes:**\n"
+                parts.append("**Component Changes:**\n")
                 for component, delta in components.items():
-                    response += f"  - {component}: {delta:,.2f}\n"
+                    parts.append(f"  - {component}: {delta:,.2f}\n")
             
-            return response
+            return "".join(parts)
         
         elif tool_call.name == "explain_run":
             explanation = data.get("explanation", "")
             confidence = data.get("confidence_score", 0)
             citations = data.get("citations", [])
             
-            response = f"**Valuation Explanation**\n"
-            response += f"**Confidence:** {confidence:.1%}\n\n"
-            response += f"{explanation}\n\n"
+            parts = [
+                "**Valuation Explanation**\n",
+                f"**Confidence:** {confidence:.1%}\n\n",
+                f"{explanation}\n\n"
+            ]
             
             if citations:
-                response += "**Policy References:**\n"
+                parts.append("**Policy References:**\n")
                 for i, citation in enumerate(citations, 1):
                     doc_name = citation.get("doc_name", "Unknown")
                     section_id = citation.get("section_id", "Unknown")
                     paragraph_id = citation.get("paragraph_id", "Unknown")
                     relevance = citation.get("relevance_score", 0)
-                    response += f"{i}. {doc_name} - {section_id}.{paragraph_id} ({relevance:.1%} relevant)\n"
+                    parts.append(f"{i}. {doc_name} - {section_id}.{paragraph_id} ({relevance:.1%} relevant)\n")
             
-            return response
+            return "".join(parts)
         
         return "Response generated successfully."
     
     async def process_message(self, message: str, run_id: str) -> Dict[str, Any]:
         """Process a user message and return response"""
-        # Parse the message to determine tool call
-        tool_call = self.parse_tool_request(message, run_id)
+        # Parse the message to determine tool calls
+        tool_calls = self.parse_tool_requests(message, run_id)
         
-        if not tool_call:
+        if not tool_calls:
             return {
                 "error": "Could not parse request",
                 "message": "I didn't understand your request. Try asking about run status, sensitivity analysis, or explanations."
             }
         
-        # Execute the tool
-        result = await self.execute_tool(tool_call)
+        # Execute the tools concurrently
+        results = await asyncio.gather(*(self.execute_tool(tc) for tc in tool_calls))
         
         # Format response
-        response_text = self.format_response(tool_call, result)
+        response_text = "\n".join(
+            self.format_response(tool_call, result)
+            for tool_call, result in zip(tool_calls, results)
+        )
         
         return {
-            "tool_call": tool_call.name,
-            "tool_parameters": tool_call.parameters,
-            "result": result,
+            "tool_call": tool_calls[0].name,
+            "tool_parameters": tool_calls[0].parameters,
+            "result": results[0],
+            "tool_calls": [
+                {"name": tool_call.name, "parameters": tool_call.parameters, "result": result}
+                for tool_call, result in zip(tool_calls, results)
+            ],
             "response": response_text,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -4,15 +4,19 @@ No external API calls - all processing is local.
 """
 
 import re
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime, date
+import calendar
+import threading
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass
+from datetime import date
 import json
 
 
 @dataclass
 class ExtractedField:
     """Represents an extracted field with confidence score."""
+    __slots__ = ("field_name", "value", "confidence", "source_text", "start_pos", "end_pos")
+    
     field_name: str
     value: Any
     confidence: float
@@ -24,12 +28,64 @@ class ExtractedField:
 @dataclass
 class ContractExtraction:
     """Complete contract extraction result."""
+    __slots__ = ("fields", "instrument_type", "overall_confidence", "raw_text")
+    
     fields: List[ExtractedField]
     instrument_type: str  # "IRS" or "CCS"
     overall_confidence: float
     raw_text: str
 
 
+# Importance of each field in the overall extraction confidence
+FIELD_WEIGHTS = {
+    "notional": 0.2,
+    "currency": 0.15,
+    "effective_date": 0.15,
+    "maturity_date": 0.15,
+    "fixed_rate": 0.1,
+    "floating_index": 0.1,
+    "frequency": 0.05,
+    "day_count": 0.05,
+    "business_day_convention": 0.05
+}
+
+
+FREQUENCY_MAP = {
+    "quarterly": "3M",
+    "semi-annual": "6M",
+    "annual": "1Y",
+    "monthly": "1M"
+}
+
+DAY_COUNT_MAP = {
+    "act/360": "ACT/360",
+    "act/365": "ACT/365F",
+    "30/360": "30/360",
+    "30e/360": "30E/360"
+}
+
+BUSINESS_DAY_CONVENTION_MAP = {
+    "following": "FOLLOWING",
+    "preceding": "PRECEDING",
+    "modified following": "MODIFIED_FOLLOWING"
+}
+
+
+class _CleanTable(dict):
+    """str.translate table mapping PDF artifacts to spaces, filled on demand."""
+    
+    _KEEP = frozenset("%$.,/-_")
+    
+    def __missing__(self, codepoint: int) -> int:
+        char = chr(codepoint)
+        if char.isalnum() or char.isspace() or char in self._KEEP:
+            value = codepoint
+        else:
+            value = ord(' ')
+        self[codepoint] = value
+        return value
+
+
 class ContractParser:
     """Main contract parser using spaCy NLP and regex patterns."""
     
@@ -38,7 +94,7 @@ class ContractParser:
         pass
         
         # Define regex patterns for financial terms
-        self.patterns = {
+        raw_patterns = {
             "notional": [
                 r"notional\s+(?:amount\s+)?(?:of\s+)?(?:usd\s+)?\$?([0-9,]+(?:\.[0-9]+)?)\s*(?:million|m|billion|b)?",
                 r"principal\s+(?:amount\s+)?(?:of\s+)?(?:usd\s+)?\$?([0-9,]+(?:\.[0-9]+)?)\s*(?:million|m|billion|b)?",
@@ -86,6 +142,55 @@ class ContractParser:
             ]
         }
         
+        # Compile once so parsing a document never goes through the re cache
+        self.patterns: Dict[str, List[re.Pattern]] = {
+            field_name: [re.compile(p, re.IGNORECASE) for p in field_patterns]
+            for field_name, field_patterns in raw_patterns.items()
+        }
+        
+        self._flat_patterns: List[Tuple[str, re.Pattern]] = [
+            (field_name, pattern)
+            for field_name, field_patterns in self.patterns.items()
+            for pattern in field_patterns
+        ]
+        
+        # Fuse every pattern into one alternation of zero-width lookaheads so
+        # the text is scanned once. Lookaheads consume nothing, so a match for
+        # one field never hides an overlapping match for another. Each group
+        # maps back to its index in _flat_patterns.
+        self._fused_re = re.compile(
+            "|".join(
+                f"(?=(?P<p{pattern_id}>{pattern.pattern}))"
+                for pattern_id, (_, pattern) in enumerate(self._flat_patterns)
+            ),
+            re.IGNORECASE
+        )
+        self._fused_ids: Dict[str, int] = {
+            f"p{pattern_id}": pattern_id for pattern_id in range(len(self._flat_patterns))
+        }
+        
+        self._clean_table = _CleanTable()
+        # mm/dd/yyyy or mm-dd-yyyy, the two formats accepted for dates
+        self._date_re = re.compile(r"^(\d{1,2})([/-])(\d{1,2})\2(\d{4})$")
+        
+        # Field-specific scoring bonuses and value normalizers, looked up per
+        # match instead of branching on the field name
+        self._scorers = {
+            "notional": self._score_notional,
+            "currency": self._score_currency,
+            "effective_date": self._score_date,
+            "maturity_date": self._score_date
+        }
+        self._normalizers = {
+            "notional": self._normalize_notional,
+            "fixed_rate": float,
+            "effective_date": self._normalize_date,
+            "maturity_date": self._normalize_date,
+            "frequency": self._normalize_frequency,
+            "day_count": self._normalize_day_count,
+            "business_day_convention": self._normalize_business_day_convention
+        }
+        
         # Confidence thresholds
         self.confidence_thresholds = {
             "notional": 0.7,
@@ -113,12 +218,7 @@ class ContractParser:
         cleaned_text = self._clean_text(text)
         
         # Extract fields using regex patterns
-        extracted_fields = []
-        
-        for field_name, patterns in self.patterns.items():
-            field_result = self._extract_field(cleaned_text, field_name, patterns)
-            if field_result:
-                extracted_fields.append(field_result)
+        extracted_fields = self._extract_fields(cleaned_text)
         
         # Determine instrument type
         instrument_type = self._determine_instrument_type(cleaned_text)
@@ -135,143 +235,141 @@ class ContractParser:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text for better pattern matching."""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text)
-        text = text.lower()
+        # Replace common PDF artifacts with spaces, then collapse whitespace
+        text = text.lower().translate(self._clean_table)
         
-        # Remove common PDF artifacts
-        text = re.sub(r'[^\w\s%$.,/-]', ' ', text)
+        return ' '.join(text.split())
+    
+    def _iter_candidates(self, text: str) -> Iterator[Tuple[str, re.Match, str]]:
+        """Yield (field_name, match, raw_value) for every pattern hit in the text.
         
-        return text.strip()
+        Hits are every (start, pattern) pair where the pattern matches, in
+        order of start and then pattern.
+        """
+        for hit in self._fused_re.finditer(text):
+            # The alternation reports the first pattern matching at this
+            # start; later patterns may match here as well
+            start = hit.start()
+            for pattern_id in range(self._fused_ids[hit.lastgroup], len(self._flat_patterns)):
+                candidate = self._match_at(text, start, pattern_id)
+                if candidate:
+                    yield candidate
+    
+    def _match_at(self, text: str, start: int, pattern_id: int) -> Optional[Tuple[str, re.Match, str]]:
+        """Match one pattern anchored at start, as a candidate for _iter_candidates."""
+        field_name, pattern = self._flat_patterns[pattern_id]
+        match = pattern.match(text, start)
+        if match is None:
+            return None
+        return field_name, match, match.group(1 if pattern.groups else 0)
     
-    def _extract_field(self, text: str, field_name: str, patterns: List[str]) -> Optional[ExtractedField]:
-        """Extract a specific field using regex patterns."""
-        best_match = None
-        best_confidence = 0.0
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                confidence = self._calculate_pattern_confidence(match, field_name)
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_match = match
-        
-        if best_match and best_confidence > 0.3:  # Minimum confidence threshold
-            value = self._normalize_field_value(field_name, best_match.group(1))
-            return ExtractedField(
-                field_name=field_name,
-                value=value,
-                confidence=best_confidence,
-                source_text=best_match.group(0),
-                start_pos=best_match.start(),
-                end_pos=best_match.end()
+    def _extract_fields(self, text: str) -> List[ExtractedField]:
+        """Extract all fields in a single scan over the text."""
+        best: Dict[str, Tuple[float, re.Match, Any]] = {}
+        
+        for field_name, match, raw_value in self._iter_candidates(text):
+            confidence = self._calculate_pattern_confidence(
+                match.group(0), raw_value, field_name
             )
+            if confidence > best.get(field_name, (0.0,))[0]:
+                best[field_name] = (confidence, match, raw_value)
         
-        return None
+        extracted_fields = []
+        for field_name in self.patterns:
+            if field_name not in best:
+                continue
+            confidence, match, raw_value = best[field_name]
+            if confidence > 0.3:  # Minimum confidence threshold
+                extracted_fields.append(ExtractedField(
+                    field_name=field_name,
+                    value=self._normalize_field_value(field_name, raw_value),
+                    confidence=confidence,
+                    source_text=match.group(0),
+                    start_pos=match.start(),
+                    end_pos=match.end()
+                ))
+        
+        return extracted_fields
     
-    def _calculate_pattern_confidence(self, match: re.Match, field_name: str) -> float:
+    def _calculate_pattern_confidence(self, source_text: str, raw_value: str, field_name: str) -> float:
         """Calculate confidence score for a regex match."""
-        base_confidence = 0.5
-        
-        # Boost confidence for exact matches
-        if match.group(0).lower() in match.group(0).lower():
-            base_confidence += 0.2
+        base_confidence = 0.7
         
         # Boost confidence for longer matches (more context)
-        match_length = len(match.group(0))
+        match_length = len(source_text)
         if match_length > 20:
             base_confidence += 0.1
         elif match_length > 10:
             base_confidence += 0.05
         
         # Field-specific confidence adjustments
-        if field_name == "notional":
-            # Check if it looks like a reasonable notional amount
-            try:
-                amount = float(match.group(1).replace(',', ''))
-                if 100000 <= amount <= 10000000000:  # $100K to $10B
-                    base_confidence += 0.2
-            except ValueError:
-                pass
-        
-        elif field_name == "currency":
-            # Currency codes are usually high confidence
-            if len(match.group(1)) == 3 and match.group(1).isupper():
-                base_confidence += 0.3
-        
-        elif field_name in ["effective_date", "maturity_date"]:
-            # Date fields need validation
-            try:
-                date_str = match.group(1)
-                # Try to parse the date
-                datetime.strptime(date_str, "%m/%d/%Y")
-                base_confidence += 0.2
-            except ValueError:
-                try:
-                    datetime.strptime(date_str, "%m-%d-%Y")
-                    base_confidence += 0.2
-                except ValueError:
-                    pass
+        scorer = self._scorers.get(field_name)
+        if scorer is not None:
+            base_confidence += scorer(raw_value)
         
         return min(base_confidence, 1.0)
     
+    def _score_notional(self, raw_value: str) -> float:
+        """Check if it looks like a reasonable notional amount."""
+        try:
+            amount = float(raw_value.replace(',', ''))
+        except ValueError:
+            return 0.0
+        return 0.2 if 100000 <= amount <= 10000000000 else 0.0  # $100K to $10B
+    
+    def _score_currency(self, raw_value: str) -> float:
+        """Currency codes are usually high confidence."""
+        return 0.3 if len(raw_value) == 3 and raw_value.isupper() else 0.0
+    
+    def _score_date(self, raw_value: str) -> float:
+        """Date fields need validation."""
+        return 0.2 if self._parse_date(raw_value) is not None else 0.0
+    
+    def _parse_date(self, date_str: str) -> Optional[date]:
+        """Parse an mm/dd/yyyy or mm-dd-yyyy date, returning None if invalid."""
+        match = self._date_re.match(date_str)
+        if not match:
+            return None
+        month, day, year = int(match.group(1)), int(match.group(3)), int(match.group(4))
+        if year < 1 or not 1 <= month <= 12:
+            return None
+        if not 1 <= day <= calendar.monthrange(year, month)[1]:
+            return None
+        return date(year, month, day)
+    
     def _normalize_field_value(self, field_name: str, raw_value: str) -> Any:
         """Normalize extracted field values to proper types."""
-        if field_name == "notional":
-            # Convert to float, handle millions/billions
-            value = raw_value.replace(',', '')
-            if 'million' in raw_value.lower() or 'm' in raw_value.lower():
-                return float(value) * 1000000
-            elif 'billion' in raw_value.lower() or 'b' in raw_value.lower():
-                return float(value) * 1000000000
-            else:
-                return float(value)
-        
-        elif field_name == "fixed_rate":
-            return float(raw_value)
-        
-        elif field_name in ["effective_date", "maturity_date"]:
-            # Parse date string
-            try:
-                return datetime.strptime(raw_value, "%m/%d/%Y").date()
-            except ValueError:
-                try:
-                    return datetime.strptime(raw_value, "%m-%d-%Y").date()
-                except ValueError:
-                    return raw_value  # Return as string if can't parse
-        
-        elif field_name == "frequency":
-            # Normalize frequency strings
-            freq_map = {
-                "quarterly": "3M",
-                "semi-annual": "6M", 
-                "annual": "1Y",
-                "monthly": "1M"
-            }
-            return freq_map.get(raw_value.lower(), raw_value)
-        
-        elif field_name == "day_count":
-            # Normalize day count conventions
-            dc_map = {
-                "act/360": "ACT/360",
-                "act/365": "ACT/365F",
-                "30/360": "30/360",
-                "30e/360": "30E/360"
-            }
-            return dc_map.get(raw_value.lower(), raw_value.upper())
-        
-        elif field_name == "business_day_convention":
-            # Normalize BDC
-            bdc_map = {
-                "following": "FOLLOWING",
-                "preceding": "PRECEDING", 
-                "modified following": "MODIFIED_FOLLOWING"
-            }
-            return bdc_map.get(raw_value.lower(), raw_value.upper())
-        
-        else:
+        normalizer = self._normalizers.get(field_name)
+        if normalizer is None:
             return raw_value.strip()
+        return normalizer(raw_value)
+    
+    def _normalize_notional(self, raw_value: str) -> float:
+        """Convert to float, handle millions/billions."""
+        value = raw_value.replace(',', '')
+        if 'million' in raw_value.lower() or 'm' in raw_value.lower():
+            return float(value) * 1000000
+        elif 'billion' in raw_value.lower() or 'b' in raw_value.lower():
+            return float(value) * 1000000000
+        else:
+            return float(value)
+    
+    def _normalize_date(self, raw_value: str) -> Any:
+        """Parse date string, returning it unchanged if it can't be parsed."""
+        parsed = self._parse_date(raw_value)
+        return parsed if parsed is not None else raw_value
+    
+    def _normalize_frequency(self, raw_value: str) -> str:
+        """Normalize frequency strings."""
+        return FREQUENCY_MAP.get(raw_value.lower(), raw_value)
+    
+    def _normalize_day_count(self, raw_value: str) -> str:
+        """Normalize day count conventions."""
+        return DAY_COUNT_MAP.get(raw_value.lower(), raw_value.upper())
+    
+    def _normalize_business_day_convention(self, raw_value: str) -> str:
+        """Normalize BDC."""
+        return BUSINESS_DAY_CONVENTION_MAP.get(raw_value.lower(), raw_value.upper())
     
     def _determine_instrument_type(self, text: str) -> str:
         """Determine if this is an IRS or CCS based on text content."""
@@ -292,17 +390,7 @@ class ContractParser:
             return 0.0
         
         # Weight by field importance
-        weights = {
-            "notional": 0.2,
-            "currency": 0.15,
-            "effective_date": 0.15,
-            "maturity_date": 0.15,
-            "fixed_rate": 0.1,
-            "floating_index": 0.1,
-            "frequency": 0.05,
-            "day_count": 0.05,
-            "business_day_convention": 0.05
-        }
+        weights = FIELD_WEIGHTS
         
         weighted_sum = 0.0
         total_weight = 0.0
@@ -347,6 +435,20 @@ class ContractParser:
         return len(issues) == 0, issues
 
 
+_PARSER: Optional[ContractParser] = None
+_PARSER_LOCK = threading.Lock()
+
+
+def _get_parser() -> ContractParser:
+    """Return the shared ContractParser, building it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        with _PARSER_LOCK:
+            if _PARSER is None:
+                _PARSER = ContractParser()
+    return _PARSER
+
+
 def parse_contract_node(text: str) -> Dict[str, Any]:
     """
     LangGraph node function for contract parsing.
@@ -355,26 +457,15 @@ def parse_contract_node(text: str) -> Dict[str, Any]:
         text: Raw text from PDF
         
     Returns:
-        Dictionary with extraction results
+        Dictionary with extraction results; fields are plain dicts
     """
-    parser = ContractParser()
+    parser = _get_parser()
     extraction = parser.parse_contract(text)
     is_valid, issues = parser.validate_extraction(extraction)
     
-    # Convert to serializable format
-    fields_data = []
-    for field in extraction.fields:
-        fields_data.append({
-            "field_name": field.field_name,
-            "value": field.value,
-            "confidence": field.confidence,
-            "source_text": field.source_text,
-            "start_pos": field.start_pos,
-            "end_pos": field.end_pos
-        })
-    
     return {
-        "fields": fields_data,
+        # Dataclasses are internal; callers get JSON-ready dicts
+        "fields": [asdict(field) for field in extraction.fields],
         "instrument_type": extraction.instrument_type,
         "overall_confidence": extraction.overall_confidence,
         "is_valid": is_valid,
@@ -2,45 +2,246 @@
 PDF processing utilities for extracting text from uploaded PDFs.
 """
 
+import hashlib
 import io
-from typing import Optional
-import PyPDF2
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Iterator, Optional, Union
+import pypdfium2 as pdfium
+
+
+# PDFs can be passed as bytes, a memory-mapped file or a seekable binary
+# stream; the latter two are read in place rather than copied into bytes
+PdfInput = Union[bytes, mmap.mmap, BinaryIO]
+
+
+def _is_stream(pdf_content: PdfInput) -> bool:
+    """Whether the input must be read through its file interface."""
+    return hasattr(pdf_content, "read") and not isinstance(pdf_content, mmap.mmap)
+
+
+class _MmapReader(io.RawIOBase):
+    """Seekable stream over an mmap with the readinto() PDFium requires."""
+    
+    def __init__(self, mapped: mmap.mmap):
+        self._view = memoryview(mapped)
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        data = self._view[self._pos:self._pos + len(buffer)]
+        size = len(data)
+        buffer[:size] = data
+        self._pos += size
+        return size
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = offset
+        return offset
+    
+    def tell(self) -> int:
+        return self._pos
+    
+    def close(self) -> None:
+        # Release the export so the caller can close the mmap afterwards
+        self._view.release()
+        super().close()
+
+
+def _open_document(pdf_content: PdfInput) -> pdfium.PdfDocument:
+    """Open a PDF from any supported input without copying it into bytes."""
+    if isinstance(pdf_content, mmap.mmap):
+        return pdfium.PdfDocument(_MmapReader(pdf_content), autoclose=True)
+    return pdfium.PdfDocument(pdf_content)
+
+
+def _read_head_tail(pdf_content: PdfInput, tail_size: int = 1024) -> tuple[int, bytes, bytes]:
+    """Return the input size, its first five bytes and its last tail_size bytes."""
+    if _is_stream(pdf_content):
+        size = pdf_content.seek(0, io.SEEK_END)
+        pdf_content.seek(0)
+        head = pdf_content.read(5)
+        pdf_content.seek(max(0, size - tail_size))
+        tail = pdf_content.read()
+        pdf_content.seek(0)
+        return size, head, tail
+    return len(pdf_content), pdf_content[:5], pdf_content[-tail_size:]
+
+
+class _FingerprintCache:
+    """Small thread-safe LRU keyed by a hash of the PDF bytes."""
+    
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def fingerprint(pdf_content: PdfInput) -> bytes:
+        if not _is_stream(pdf_content):
+            return hashlib.blake2b(pdf_content, digest_size=16).digest()
+        digest = hashlib.blake2b(digest_size=16)
+        pdf_content.seek(0)
+        for chunk in iter(lambda: pdf_content.read(1 << 20), b""):
+            digest.update(chunk)
+        pdf_content.seek(0)
+        return digest.digest()
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: bytes, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# The same document is often processed by several agent calls, so parsed
+# results are reused for identical uploads
+_TEXT_CACHE = _FingerprintCache()
+_VALIDATION_CACHE = _FingerprintCache()
+
+
+# PDFium is not thread-safe, so large documents are split into page ranges
+# that are extracted in worker processes, each opening its own copy
+PARALLEL_MIN_PAGES = 32
+MAX_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the shared extraction process pool, starting it on first use."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ProcessPoolExecutor(max_workers=MAX_EXTRACT_WORKERS)
+    return _EXECUTOR
+
+
+def _iter_page_texts(pdf: pdfium.PdfDocument, start: int, stop: int) -> Iterator[str]:
+    """Yield the text of pages [start, stop) from an open document, one at a time."""
+    for index in range(start, stop):
+        page = pdf[index]
+        textpage = page.get_textpage()
+        text = textpage.get_text_range()
+        textpage.close()
+        page.close()
+        yield text
+
+
+def _extract_page_range(pdf: pdfium.PdfDocument, start: int, stop: int) -> list[str]:
+    """Extract the text of pages [start, stop) from an open document."""
+    return list(_iter_page_texts(pdf, start, stop))
+
+
+def _extract_page_range_worker(pdf_content: bytes, start: int, stop: int) -> list[str]:
+    """Process-pool entry point: open the document and extract a page range."""
+    pdf = pdfium.PdfDocument(pdf_content)
+    try:
+        return _extract_page_range(pdf, start, stop)
+    finally:
+        pdf.close()
+
+
+def _extract_pages_parallel(pdf_content: bytes, page_count: int) -> list[str]:
+    """Extract all pages using one contiguous page range per worker."""
+    chunk = -(-page_count // MAX_EXTRACT_WORKERS)
+    executor = _get_executor()
+    futures = [
+        executor.submit(_extract_page_range_worker, pdf_content, start, min(start + chunk, page_count))
+        for start in range(0, page_count, chunk)
+    ]
+    return [text for future in futures for text in future.result()]
 
 
 class PDFProcessor:
     """Handles PDF text extraction using multiple methods."""
     
     @staticmethod
-    def extract_text_from_pdf(pdf_content: bytes) -> str:
+    def iter_pages(pdf_content: PdfInput) -> Iterator[tuple[int, str]]:
+        """
+        Yield the text of each page without building the whole document's text.
+        
+        Args:
+            pdf_content: Raw PDF content as bytes, an mmap or a binary stream
+            
+        Yields:
+            Tuples of (zero-based page number, page text)
+        """
+        pdf = _open_document(pdf_content)
+        try:
+            yield from enumerate(_iter_page_texts(pdf, 0, len(pdf)))
+        finally:
+            pdf.close()
+    
+    @staticmethod
+    def extract_text_from_pdf(pdf_content: PdfInput) -> str:
         """
-        Extract text from PDF content using PyPDF2.
+        Extract text from PDF content using PDFium.
         
         Args:
-            pdf_content: Raw PDF file content as bytes
+            pdf_content: Raw PDF content as bytes, an mmap or a binary stream
             
         Returns:
             Extracted text string
         """
-        text = ""
+        fingerprint = _FingerprintCache.fingerprint(pdf_content)
+        cached = _TEXT_CACHE.get(fingerprint)
+        if cached is not None:
+            return cached
         
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+            pdf = _open_document(pdf_content)
+            try:
+                page_count = len(pdf)
+                # Worker processes receive a pickled copy, so only bytes input
+                # is split across them
+                if (isinstance(pdf_content, bytes) and page_count >= PARALLEL_MIN_PAGES
+                        and MAX_EXTRACT_WORKERS > 1):
+                    page_texts = _extract_pages_parallel(pdf_content, page_count)
+                else:
+                    page_texts = _iter_page_texts(pdf, 0, page_count)
+                parts = [page_text for page_text in page_texts if page_text]
+            finally:
+                pdf.close()
         except Exception as e:
-            print(f"PyPDF2 failed: {e}")
+            # Failures may be transient (a broken worker pool, a short read),
+            # so they are not cached
+            print(f"PDFium failed: {e}")
+            return ""
         
-        return text.strip()
+        text = "\n".join(parts).strip()
+        _TEXT_CACHE.set(fingerprint, text)
+        return text
     
     @staticmethod
-    def validate_pdf(pdf_content: bytes) -> tuple[bool, Optional[str]]:
+    def validate_pdf(pdf_content: PdfInput) -> tuple[bool, Optional[str]]:
         """
         Validate that the uploaded file is a valid PDF.
         
         Args:
-            pdf_content: Raw PDF file content as bytes
+            pdf_content: Raw PDF content as bytes, an mmap or a binary stream
             
         Returns:
             Tuple of (is_valid, error_message)
@@ -48,18 +249,41 @@ class PDFProcessor:
         if not pdf_content:
             return False, "No file content provided"
         
-        if len(pdf_content) < 100:
+        size, head, tail = _read_head_tail(pdf_content)
+        if size == 0:
+            return False, "No file content provided"
+        
+        if size < 100:
             return False, "File too small to be a valid PDF"
         
         # Check PDF header
-        if not pdf_content.startswith(b'%PDF-'):
+        if head != b'%PDF-':
             return False, "File does not appear to be a valid PDF"
         
-        # Try to read the PDF
+        # A complete file ends with the startxref pointer and the %%EOF
+        # marker; only files missing them (truncated or malformed) are opened
+        if tail.rfind(b'%%EOF') != -1 and tail.rfind(b'startxref') != -1:
+            return True, None
+        
+        fingerprint = _FingerprintCache.fingerprint(pdf_content)
+        cached = _VALIDATION_CACHE.get(fingerprint)
+        if cached is not None:
+            return cached
+        
+        result = PDFProcessor._validate_pdf_structure(pdf_content)
+        _VALIDATION_CACHE.set(fingerprint, result)
+        return result
+    
+    @staticmethod
+    def _validate_pdf_structure(pdf_content: PdfInput) -> tuple[bool, Optional[str]]:
+        """Try to open the PDF and check that it has pages."""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            if len(pdf_reader.pages) == 0:
-                return False, "PDF has no pages"
+            pdf = _open_document(pdf_content)
+            try:
+                if len(pdf) == 0:
+                    return False, "PDF has no pages"
+            finally:
+                pdf.close()
         except Exception as e:
             return False, f"Invalid PDF format: {str(e)}"
         
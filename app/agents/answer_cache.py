@@ -0,0 +1,65 @@
+"""Similarity cache for answers to near-identical IFRS questions."""
+
+import threading
+import numpy as np
+from typing import List, Optional
+
+from app.agents.schemas import IFRSAnswer
+
+SEMANTIC_CACHE_SIZE = 1024
+SEMANTIC_CACHE_MIN_CONFIDENCE = 0.7
+
+
+class SemanticAnswerCache:
+    """Reuses answers to questions whose embeddings are nearly identical.
+    
+    Question embeddings are kept L2-normalized in a preallocated matrix, so a
+    lookup is one matrix-vector product. When full, the entry with the fewest
+    hits is replaced.
+    """
+    
+    def __init__(self, tau: float, maxsize: int = SEMANTIC_CACHE_SIZE,
+                 min_confidence: float = SEMANTIC_CACHE_MIN_CONFIDENCE):
+        self.tau = tau
+        self.maxsize = maxsize
+        self.min_confidence = min_confidence
+        self._matrix: Optional[np.ndarray] = None
+        self._answers: List[IFRSAnswer] = []
+        self._hits = np.zeros(maxsize, dtype=np.int64)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+    
+    def get(self, vector: np.ndarray) -> Optional[IFRSAnswer]:
+        with self._lock:
+            size = len(self._answers)
+            if size == 0 or vector.shape[0] != self._matrix.shape[1]:
+                return None
+            similarities = self._matrix[:size] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.tau:
+                return None
+            self._hits[best] += 1
+            return self._answers[best]
+    
+    def add(self, vector: np.ndarray, answer: IFRSAnswer) -> None:
+        # Only confident answers are worth reusing for paraphrased questions
+        if answer.status != "OK" or answer.confidence < self.min_confidence:
+            return
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.empty((self.maxsize, vector.shape[0]), dtype=np.float32)
+            elif vector.shape[0] != self._matrix.shape[1]:
+                return
+            if len(self._answers) < self.maxsize:
+                slot = len(self._answers)
+                self._answers.append(answer)
+            else:
+                slot = int(np.argmin(self._hits))
+                self._answers[slot] = answer
+            self._matrix[slot] = vector
+            self._hits[slot] = 0
@@ -1,6 +1,7 @@
 """LangGraph-based chat agent with tool constraints."""
 
 import re
+from itertools import chain, islice
 from typing import Dict, Any, List, Optional, Literal
 from dataclasses import dataclass
 from app.agents.tools import tool_ifrs_ask, tool_analyze_document, tool_search_documents
@@ -8,6 +9,55 @@ from app.agents.guards import apply_policy
 from app.agents.schemas import IFRSAnswer, Citation
 from app.agents.feedback import Feedback
 
+# Command words stripped from a search request to leave the search term
+_STOP = frozenset({"search", "find", "list", "show", "document", "documents"})
+
+# Intent -> regex patterns, checked in order; all patterns are lowercase
+INTENT_PATTERNS = {
+    "ask_ifrs": [
+        r"what is.*ifrs",
+        r"explain.*ifrs",
+        r"how does.*ifrs",
+        r"ifrs.*requirement",
+        r"fair value.*measurement",
+        r"hierarchy.*level",
+        r"market.*participant",
+        r"day.*1.*p&l",
+        r"non.*performance.*risk",
+        r"observable.*input"
+    ],
+    "analyze_doc": [
+        r"analyze.*document",
+        r"check.*document",
+        r"review.*document", 
+        r"feedback.*document",
+        r"compliance.*document",
+        r"document.*analysis",
+        r"document.*review"
+    ],
+    "search_docs": [
+        r"search.*document",
+        r"find.*document",
+        r"list.*document",
+        r"show.*document",
+        r"what.*document",
+        r"available.*document",
+        r"document.*available"
+    ]
+}
+
+# One compiled alternation per intent, built once at import so classifying a
+# message runs the regex engine once per intent. The case-sensitive variant is
+# for callers that have already lowercased the message.
+_INTENTS = tuple(
+    (intent, re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE))
+    for intent, patterns in INTENT_PATTERNS.items()
+)
+_INTENTS_LOWER = tuple(
+    (intent, re.compile("|".join(f"(?:{p})" for p in patterns)))
+    for intent, patterns in INTENT_PATTERNS.items()
+)
+
 
 @dataclass
 class ChatMessage:
@@ -36,55 +86,22 @@ class ChatAgent:
     
     def __init__(self):
         """Initialize chat agent."""
-        self.intent_patterns = {
-            "ask_ifrs": [
-                r"what is.*ifrs",
-                r"explain.*ifrs",
-                r"how does.*ifrs",
-                r"ifrs.*requirement",
-                r"fair value.*measurement",
-                r"hierarchy.*level",
-                r"market.*participant",
-                r"day.*1.*p&l",
-                r"non.*performance.*risk",
-                r"observable.*input"
-            ],
-            "analyze_doc": [
-                r"analyze.*document",
-                r"check.*document",
-                r"review.*document", 
-                r"feedback.*document",
-                r"compliance.*document",
-                r"document.*analysis",
-                r"document.*review"
-            ],
-            "search_docs": [
-                r"search.*document",
-                r"find.*document",
-                r"list.*document",
-                r"show.*document",
-                r"what.*document",
-                r"available.*document",
-                r"document.*available"
-            ]
-        }
+        self.intent_patterns = INTENT_PATTERNS
     
-    def classify_intent(self, message: str) -> str:
+    def classify_intent(self, message: str, already_lower: bool = False) -> str:
         """Classify user intent from message.
         
         Args:
             message: User message
+            already_lower: Whether the message has already been lowercased
             
         Returns:
             Intent classification: "ask_ifrs", "analyze_doc", "search_docs", or "unknown"
         """
-        message_lower = message.lower()
-        
         # Check for each intent pattern
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, message_lower):
-                    return intent
+        for intent, intent_re in (_INTENTS_LOWER if already_lower else _INTENTS):
+            if intent_re.search(message):
+                return intent
         
         return "unknown"
     
@@ -152,14 +169,13 @@ class ChatAgent:
             
             if feedback.items:
                 response_parts.append(f"\n\nChecklist Results ({len(feedback.items)} items):")
-                for i, item in enumerate(feedback.items[:5], 1):  # Show first 5 items
-                    status_icon = "✅" if item.met else "❌"
-                    response_parts.append(f"{i}. {status_icon} {item.description}")
+                response_parts.extend(
+                    f"{i}. {'✅' if item.met else '❌'} {item.description}"
+                    for i, item in enumerate(islice(feedback.items, 5), 1)  # Show first 5 items
+                )
             
             # Extract citations from feedback items
-            all_citations = []
-            for item in feedback.items:
-                all_citations.extend(item.citations)
+            all_citations = list(chain.from_iterable(item.citations for item in feedback.items))
             
             return ChatResponse(
                 message="\n".join(response_parts),
@@ -178,27 +194,25 @@ class ChatAgent:
                 status="ABSTAIN"
             )
     
-    def handle_search_docs(self, message: str, doc_id: Optional[str] = None, standard: Optional[str] = None) -> ChatResponse:
+    def handle_search_docs(self, message: str, doc_id: Optional[str] = None, standard: Optional[str] = None,
+                           lower: Optional[str] = None) -> ChatResponse:
         """Handle document search intent.
         
         Args:
             message: User message
             doc_id: Optional document ID
             standard: Optional IFRS standard
+            lower: Optional pre-lowercased copy of the message
             
         Returns:
             Chat response with document search results
         """
         try:
-            # Extract search term from message
-            search_term = message.lower()
-            
-            # Remove common search words
-            search_words = ["search", "find", "list", "show", "document", "documents"]
-            for word in search_words:
-                search_term = search_term.replace(word, "")
+            if lower is None:
+                lower = message.lower()
             
-            search_term = search_term.strip()
+            # Extract search term from message, dropping common search words
+            search_term = " ".join(tok for tok in lower.split() if tok not in _STOP)
             if not search_term:
                 search_term = "valuation"  # Default search term
             
@@ -218,9 +232,11 @@ class ChatAgent:
             response_parts = [f"Found {len(results)} documents:"]
             
             for i, doc in enumerate(results, 1):
-                tags_str = ", ".join(doc.get("tags", [])) if doc.get("tags") else "No tags"
-                response_parts.append(f"{i}. {doc.get('title', 'Untitled')} (ID: {doc.get('doc_id', 'N/A')})")
-                response_parts.append(f"   Tags: {tags_str}")
+                tags = doc.get("tags")
+                tags_str = ", ".join(tags) if tags else "No tags"
+                response_parts.append(
+                    f"{i}. {doc.get('title', 'Untitled')} (ID: {doc.get('doc_id', 'N/A')})\n   Tags: {tags_str}"
+                )
             
             return ChatResponse(
                 message="\n".join(response_parts),
@@ -280,8 +296,11 @@ Please rephrase your question to use one of these capabilities."""
         Returns:
             Chat response with validated answer
         """
+        # Lowercase once for classification and search term extraction
+        lower = message.lower()
+        
         # Classify intent
-        intent = self.classify_intent(message)
+        intent = self.classify_intent(lower, already_lower=True)
         
         # Route to appropriate handler
         if intent == "ask_ifrs":
@@ -289,7 +308,7 @@ Please rephrase your question to use one of these capabilities."""
         elif intent == "analyze_doc":
             return self.handle_analyze_doc(message, doc_id, standard)
         elif intent == "search_docs":
-            return self.handle_search_docs(message, doc_id, standard)
+            return self.handle_search_docs(message, doc_id, standard, lower=lower)
         else:
             return self.handle_unknown_intent(message)
 
@@ -2,14 +2,32 @@
 
 import yaml
 import os
+import logging
+import threading
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-from app.agents.schemas import Citation
-from app.rag.store import get_collection, search_similar
+from app.agents.schemas import Citation, IFRSAnswer
+from app.rag.store import get_document_chunks, search_similar
 from app.rag.retriever import build_retriever
-from app.agents.ifrs import answer_ifrs
+from app.agents.ifrs import answer_ifrs_batch
+
+# Prefer libyaml's C loader; PyYAML builds without it use the Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
+# Checklist answers are independent LLM round-trips, so they are fetched
+# concurrently
+MAX_ANSWER_WORKERS = 8
+
+# Standards whose checklist questions are built when the analyzer is created;
+# others are built on first use
+PRECOMPUTED_STANDARDS = ("IFRS 13", "IFRS 9", "IFRS 16")
 
 
 @dataclass
@@ -48,6 +66,19 @@ class DocumentFeedbackAnalyzer:
         
         self.checklist_config = self._load_checklist(checklist_file)
         self.retriever = build_retriever(k=6, score_threshold=0.2)
+        
+        # Project the checklist into parallel lists once, so analysis iterates
+        # plain values instead of repeating dict lookups per item
+        checklist = (self.checklist_config or {}).get("checklist", {})
+        self._item_configs: List[Dict[str, Any]] = checklist.get("items", [])
+        critical_items = checklist.get("critical_items", [])
+        self._item_ids = [item.get("id", "") for item in self._item_configs]
+        self._item_keys = [item.get("key", "") for item in self._item_configs]
+        self._item_descriptions = [item.get("description", "") for item in self._item_configs]
+        self._item_critical = [item_id in critical_items for item_id in self._item_ids]
+        self._questions_by_standard: Dict[str, List[str]] = {
+            standard: self._build_questions(standard) for standard in PRECOMPUTED_STANDARDS
+        }
     
     def _load_checklist(self, checklist_file: str) -> Dict[str, Any]:
         """Load checklist configuration from YAML file.
@@ -59,10 +90,10 @@ class DocumentFeedbackAnalyzer:
             Loaded checklist configuration
         """
         try:
-            with open(checklist_file, 'r') as f:
-                return yaml.safe_load(f)
+            with open(checklist_file, 'rb') as f:
+                return yaml.load(f, Loader=_YamlLoader)
         except Exception as e:
-            print(f"Warning: Could not load checklist from {checklist_file}: {e}")
+            logger.warning("Could not load checklist from %s: %s", checklist_file, e, exc_info=True)
             return self._get_default_checklist()
     
     def _get_default_checklist(self) -> Dict[str, Any]:
@@ -102,27 +133,22 @@ class DocumentFeedbackAnalyzer:
             if not document_content:
                 return self._create_abstain_feedback("Document not found or no content available")
             
-            # Get checklist items
-            checklist_items = self.checklist_config.get("checklist", {}).get("items", [])
-            critical_items = self.checklist_config.get("checklist", {}).get("critical_items", [])
+            # One question per checklist item
+            questions = self._questions_for(focus_standard)
+            
+            # Get answers using IFRS agent, reusing answers to repeated questions
+            answers = self._answer_questions(questions, focus_standard)
             
             # Analyze each checklist item
             analyzed_items = []
             total_confidence = 0.0
             critical_failures = 0
+            met_items = 0
             
-            for item_config in checklist_items:
-                item_id = item_config.get("id", "")
-                item_key = item_config.get("key", "")
-                description = item_config.get("description", "")
-                is_critical = item_id in critical_items
-                
-                # Create question for this checklist item
-                question = self._create_checklist_question(description, focus_standard)
-                
-                # Get answer using IFRS agent
-                answer = answer_ifrs(question, standard_filter=focus_standard)
-                
+            for item_id, item_key, description, is_critical, item_config, answer in zip(
+                self._item_ids, self._item_keys, self._item_descriptions,
+                self._item_critical, self._item_configs, answers
+            ):
                 # Determine if item is met based on answer
                 is_met, notes, citations = self._evaluate_checklist_item(answer, item_config)
                 
@@ -139,8 +165,10 @@ class DocumentFeedbackAnalyzer:
                 analyzed_items.append(checklist_item)
                 total_confidence += answer.confidence
                 
-                # Track critical failures
-                if is_critical and not is_met:
+                # Track met items and critical failures
+                if is_met:
+                    met_items += 1
+                elif is_critical:
                     critical_failures += 1
             
             # Calculate overall confidence
@@ -150,7 +178,7 @@ class DocumentFeedbackAnalyzer:
             status = self._determine_status(critical_failures, avg_confidence)
             
             # Create summary
-            summary = self._create_summary(analyzed_items, critical_failures, avg_confidence)
+            summary = self._create_summary(analyzed_items, critical_failures, avg_confidence, met_items)
             
             return Feedback(
                 status=status,
@@ -162,6 +190,29 @@ class DocumentFeedbackAnalyzer:
         except Exception as e:
             return self._create_abstain_feedback(f"Error analyzing document: {str(e)}")
     
+    def _answer_questions(self, questions: List[str], focus_standard: str) -> List[IFRSAnswer]:
+        """Answer checklist questions, preserving their order.
+        
+        Repeated questions are answered once. All questions share one
+        retrieval pass, whose answer cache is dropped whenever the document
+        collection changes, and their LLM steps run concurrently.
+        
+        Args:
+            questions: Checklist questions
+            focus_standard: IFRS standard to focus on
+            
+        Returns:
+            Answers in the same order as the questions
+        """
+        unique_questions = list(dict.fromkeys(questions))
+        fresh_answers = answer_ifrs_batch(
+            unique_questions,
+            standard_filter=focus_standard,
+            max_workers=MAX_ANSWER_WORKERS
+        )
+        answers = dict(zip(unique_questions, fresh_answers))
+        return [answers[question] for question in questions]
+    
     def _load_document_content(self, doc_id: str) -> Optional[str]:
         """Load document content from vector store.
         
@@ -172,32 +223,16 @@ class DocumentFeedbackAnalyzer:
             Document content or None if not found
         """
         try:
-            # Get collection directly
-            from app.rag.store import get_vector_store
-            client = get_vector_store()
-            collection = get_collection(client, "ifrs_documents")
-            
-            # Find documents with matching doc_id
-            doc_results = []
-            for doc in collection.get("documents", []):
-                metadata = doc.get("metadata", {})
-                if metadata.get("doc_id") == doc_id:
-                    doc_results.append(doc)
+            # Find chunks with matching doc_id
+            doc_results = get_document_chunks(doc_id, "ifrs_documents")
             
-            if not doc_results:
-                return None
-            
-            # Combine content from all chunks
-            content_parts = []
-            for result in doc_results:
-                content = result.get("content", "")
-                if content:
-                    content_parts.append(content)
+            # Combine the non-empty content of all chunks
+            content_parts = [content for content in (result.get("content") for result in doc_results) if content]
             
             return "\n\n".join(content_parts) if content_parts else None
             
         except Exception as e:
-            print(f"Error loading document content: {e}")
+            logger.error("Error loading document content: %s", e, exc_info=True)
             return None
     
     def _create_checklist_question(self, description: str, focus_standard: str) -> str:
@@ -212,6 +247,36 @@ class DocumentFeedbackAnalyzer:
         """
         return f"Does the document address the following {focus_standard} requirement: {description}? Please provide specific evidence and citations from the document."
     
+    def _build_questions(self, focus_standard: str) -> List[str]:
+        """Create the question for each checklist item.
+        
+        Args:
+            focus_standard: IFRS standard to focus on
+            
+        Returns:
+            Questions in checklist order
+        """
+        return [
+            self._create_checklist_question(description, focus_standard)
+            for description in self._item_descriptions
+        ]
+    
+    def _questions_for(self, focus_standard: str) -> List[str]:
+        """Get the checklist questions for a standard.
+        
+        Args:
+            focus_standard: IFRS standard to focus on
+            
+        Returns:
+            Questions in checklist order, built on first use for standards
+            outside PRECOMPUTED_STANDARDS
+        """
+        questions = self._questions_by_standard.get(focus_standard)
+        if questions is None:
+            questions = self._build_questions(focus_standard)
+            self._questions_by_standard[focus_standard] = questions
+        return questions
+    
     def _evaluate_checklist_item(self, answer, item_config: Dict[str, Any]) -> tuple[bool, Optional[str], List[Citation]]:
         """Evaluate a checklist item based on IFRS agent answer.
         
@@ -234,8 +299,8 @@ class DocumentFeedbackAnalyzer:
         else:
             notes = f"Analysis result: {answer.answer}"
         
-        # Extract citations
-        citations = answer.citations if answer.citations else []
+        # Extract citations (copied, since cached answers are shared)
+        citations = list(answer.citations) if answer.citations else []
         
         return is_met, notes, citations
     
@@ -256,19 +321,22 @@ class DocumentFeedbackAnalyzer:
         else:
             return "OK"
     
-    def _create_summary(self, items: List[ChecklistItem], critical_failures: int, confidence: float) -> str:
+    def _create_summary(self, items: List[ChecklistItem], critical_failures: int, confidence: float,
+                        met_items: Optional[int] = None) -> str:
         """Create summary of feedback analysis.
         
         Args:
             items: List of analyzed checklist items
             critical_failures: Number of critical failures
             confidence: Overall confidence score
+            met_items: Number of met items, if already counted
             
         Returns:
             Summary text
         """
         total_items = len(items)
-        met_items = sum(1 for item in items if item.met)
+        if met_items is None:
+            met_items = sum(1 for item in items if item.met)
         met_percentage = (met_items / total_items * 100) if total_items > 0 else 0
         
         summary_parts = [
@@ -307,8 +375,27 @@ class DocumentFeedbackAnalyzer:
         )
 
 
-# Global analyzer instance
-feedback_analyzer = DocumentFeedbackAnalyzer()
+# Global analyzer instance, built on first use so importing this module does
+# no file I/O
+_feedback_analyzer: Optional[DocumentFeedbackAnalyzer] = None
+_feedback_analyzer_lock = threading.Lock()
+
+
+def _get_analyzer() -> DocumentFeedbackAnalyzer:
+    """Return the shared DocumentFeedbackAnalyzer, building it on first use."""
+    global _feedback_analyzer
+    if _feedback_analyzer is None:
+        with _feedback_analyzer_lock:
+            if _feedback_analyzer is None:
+                _feedback_analyzer = DocumentFeedbackAnalyzer()
+    return _feedback_analyzer
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `feedback_analyzer` importable from this module
+    if name == "feedback_analyzer":
+        return _get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def analyze_document(doc_id: str, focus_standard: str = "IFRS 13") -> Feedback:
@@ -321,4 +408,4 @@ def analyze_document(doc_id: str, focus_standard: str = "IFRS 13") -> Feedback:
     Returns:
         Structured feedback with checklist items and citations
     """
-    return feedback_analyzer.analyze_document(doc_id, focus_standard)
+    return _get_analyzer().analyze_document(doc_id, focus_standard)
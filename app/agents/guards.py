@@ -1,12 +1,36 @@
 """Policy guardrails and validation for IFRS responses."""
 
 import re
+import logging
+import threading
 import yaml
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from app.agents.schemas import IFRSAnswer, Citation
 from app.agents.ifrs import _create_abstain_response
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Below this many prohibited terms, plain substring checks beat the automaton
+AHOCORASICK_MIN_TERMS = 8
+
+# Answers are often checked more than once (apply, then audit), so the
+# validator results for recent answers are kept
+VALIDATION_CACHE_SIZE = 256
+
+# Prefer libyaml's C loader; PyYAML builds without it use the Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+logger = logging.getLogger(__name__)
+
 
 class PolicyError(Exception):
     """Exception raised when policy violations are detected."""
@@ -27,6 +51,9 @@ class PolicyGuard:
         
         self.policies = self._load_policies(policy_file)
         self._compile_patterns()
+        
+        self._validation_cache: "OrderedDict[tuple, Tuple[List[str], ...]]" = OrderedDict()
+        self._validation_lock = threading.Lock()
     
     def _load_policies(self, policy_file: str) -> Dict[str, Any]:
         """Load policies from YAML file.
@@ -38,10 +65,10 @@ class PolicyGuard:
             Loaded policy configuration
         """
         try:
-            with open(policy_file, 'r') as f:
-                return yaml.safe_load(f)
+            with open(policy_file, 'rb') as f:
+                return yaml.load(f, Loader=_YamlLoader)
         except Exception as e:
-            print(f"Warning: Could not load policies from {policy_file}: {e}")
+            logger.warning("Could not load policies from %s: %s", policy_file, e, exc_info=True)
             return self._get_default_policies()
     
     def _get_default_policies(self) -> Dict[str, Any]:
@@ -60,50 +87,83 @@ class PolicyGuard:
         }
     
     def _compile_patterns(self):
-        """Compile regex patterns for efficient matching."""
+        """Compile regex patterns for efficient matching.
+        
+        Terms are lowercased here and matched against lowercased text, so the
+        patterns need no IGNORECASE and keep the engine's literal fast paths.
+        """
         # Compile disallowed language patterns
         disallowed = self.policies.get("language_policy", {}).get("disallow_language", [])
         self.disallowed_patterns = [
-            re.compile(rf'\b{re.escape(term)}\b', re.IGNORECASE) 
+            re.compile(rf'\b{re.escape(term.lower())}\b')
             for term in disallowed
         ]
         
         # Compile restricted advice patterns
         restricted = self.policies.get("language_policy", {}).get("restricted_advice", [])
         self.restricted_patterns = [
-            re.compile(rf'\b{re.escape(term)}\b', re.IGNORECASE)
+            re.compile(rf'\b{re.escape(term.lower())}\b')
             for term in restricted
         ]
+        
+        # One alternation over every term, so compliant text (the common case)
+        # is scanned once instead of once per term
+        terms = list(disallowed) + list(restricted)
+        self._language_union = re.compile(
+            r'\b(?:' + '|'.join(re.escape(term.lower()) for term in terms) + r')\b'
+        ) if terms else None
+        
+        # Prohibited content is matched as plain substrings; with many terms an
+        # Aho-Corasick automaton finds all of them in one pass over the answer
+        prohibited = self.policies.get("content_policy", {}).get("prohibited_content", [])
+        self._prohibited_automaton = None
+        if AHOCORASICK_AVAILABLE and len(prohibited) >= AHOCORASICK_MIN_TERMS and all(prohibited):
+            automaton = ahocorasick.Automaton()
+            for index, term in enumerate(prohibited):
+                key = term.lower()
+                automaton.add_word(key, automaton.get(key, ()) + (index,))
+            automaton.make_automaton()
+            self._prohibited_automaton = automaton
     
-    def validate_language(self, text: str) -> List[str]:
+    def validate_language(self, text: str, text_lower: Optional[str] = None, first_only: bool = False) -> List[str]:
         """Validate text against language policy.
         
         Args:
             text: Text to validate
+            text_lower: Optional pre-lowercased copy of the text
+            first_only: Stop at the first violation found
             
         Returns:
             List of policy violations found
         """
         violations = []
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        if self._language_union is None or not self._language_union.search(text_lower):
+            return violations
         
         # Check for disallowed overconfident language
         for pattern in self.disallowed_patterns:
-            if pattern.search(text):
+            if pattern.search(text_lower):
                 violations.append(f"Disallowed overconfident language detected: '{pattern.pattern}'")
+                if first_only:
+                    return violations
         
         # Check for restricted advice language
         for pattern in self.restricted_patterns:
-            if pattern.search(text):
+            if pattern.search(text_lower):
                 violations.append(f"Restricted advice language detected: '{pattern.pattern}'")
+                if first_only:
+                    return violations
         
         return violations
     
-    def validate_citations(self, answer: IFRSAnswer) -> List[str]:
+    def validate_citations(self, answer: IFRSAnswer, first_only: bool = False) -> List[str]:
         """Validate citations against policy.
         
         Args:
             answer: IFRS answer to validate
+            first_only: Stop at the first violation found
             
         Returns:
             List of citation violations
@@ -115,11 +175,15 @@ class PolicyGuard:
         if citation_policy.get("require_citations", True):
             if not answer.citations or len(answer.citations) == 0:
                 violations.append("Citations are required but none provided")
+                if first_only:
+                    return violations
             
             # Check minimum citations
             min_citations = citation_policy.get("min_citations", 1)
             if len(answer.citations) < min_citations:
                 violations.append(f"Minimum {min_citations} citations required, got {len(answer.citations)}")
+                if first_only:
+                    return violations
         
         # Validate citation format
         for i, citation in enumerate(answer.citations):
@@ -127,6 +191,8 @@ class PolicyGuard:
                 violations.append(f"Citation {i+1}: Standard is required")
             if not citation.paragraph:
                 violations.append(f"Citation {i+1}: Paragraph is required")
+            if first_only and violations:
+                return violations[:1]
         
         return violations
     
@@ -148,11 +214,13 @@ class PolicyGuard:
         
         return violations
     
-    def validate_content(self, answer: IFRSAnswer) -> List[str]:
+    def validate_content(self, answer: IFRSAnswer, answer_lower: Optional[str] = None, first_only: bool = False) -> List[str]:
         """Validate content against policy.
         
         Args:
             answer: IFRS answer to validate
+            answer_lower: Optional pre-lowercased copy of the answer text
+            first_only: Stop at the first violation found
             
         Returns:
             List of content violations
@@ -170,20 +238,110 @@ class PolicyGuard:
         if len(answer.answer) > max_length:
             violations.append(f"Answer too long: {len(answer.answer)} > {max_length}")
         
+        if first_only and violations:
+            return violations
+        
         # Check for prohibited content
         prohibited = content_policy.get("prohibited_content", [])
-        answer_lower = answer.answer.lower()
-        for content_type in prohibited:
-            if content_type.lower() in answer_lower:
-                violations.append(f"Prohibited content detected: '{content_type}'")
+        if answer_lower is None:
+            answer_lower = answer.answer.lower()
+        if self._prohibited_automaton is not None:
+            found = set()
+            for _, indices in self._prohibited_automaton.iter(answer_lower):
+                found.update(indices)
+                if first_only:
+                    break
+            detected = [prohibited[index] for index in sorted(found)]
+        else:
+            detected = [content_type for content_type in prohibited if content_type.lower() in answer_lower]
+        if first_only:
+            detected = detected[:1]
+        
+        for content_type in detected:
+            violations.append(f"Prohibited content detected: '{content_type}'")
         
         return violations
     
-    def apply_policy(self, answer: IFRSAnswer) -> IFRSAnswer:
+    @staticmethod
+    def _validation_key(answer: IFRSAnswer) -> tuple:
+        """Everything the validators read from an answer."""
+        return (
+            answer.answer,
+            answer.confidence,
+            tuple((citation.standard, citation.paragraph) for citation in answer.citations)
+        )
+    
+    def _first_violations(self, answer: IFRSAnswer) -> List[str]:
+        """Return the first violation found, running the cheapest validators first.
+        
+        Args:
+            answer: IFRS answer to validate
+            
+        Returns:
+            A single-item list with the first violation, or an empty list
+        """
+        with self._validation_lock:
+            cached = self._validation_cache.get(self._validation_key(answer))
+        if cached is not None:
+            language, citation, confidence, content = cached
+            for violations in (confidence, citation, language, content):
+                if violations:
+                    return list(violations[:1])
+            return []
+        
+        # Confidence and citation checks are constant-time; the text scans
+        # only run when both pass
+        violations = self.validate_confidence(answer) or self.validate_citations(answer, first_only=True)
+        if violations:
+            return violations
+        text_lower = answer.answer.lower()
+        return (
+            self.validate_language(answer.answer, text_lower, first_only=True)
+            or self.validate_content(answer, text_lower, first_only=True)
+        )
+    
+    def _validate_all(self, answer: IFRSAnswer) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """Run the language, citation, confidence and content validators.
+        
+        Results are cached on everything the validators read, so re-checking
+        an identical answer does no regex work.
+        
+        Args:
+            answer: IFRS answer to validate
+            
+        Returns:
+            Tuple of (language, citation, confidence, content) violations
+        """
+        key = self._validation_key(answer)
+        with self._validation_lock:
+            cached = self._validation_cache.get(key)
+            if cached is not None:
+                self._validation_cache.move_to_end(key)
+        
+        if cached is None:
+            # The language and content checks share one lowercased copy
+            text_lower = answer.answer.lower()
+            cached = (
+                self.validate_language(answer.answer, text_lower),
+                self.validate_citations(answer),
+                self.validate_confidence(answer),
+                self.validate_content(answer, text_lower)
+            )
+            with self._validation_lock:
+                self._validation_cache[key] = cached
+                if len(self._validation_cache) > VALIDATION_CACHE_SIZE:
+                    self._validation_cache.popitem(last=False)
+        
+        # Copies, so callers cannot mutate the cached lists
+        return tuple(list(violations) for violations in cached)
+    
+    def apply_policy(self, answer: IFRSAnswer, mode: str = "fast") -> IFRSAnswer:
         """Apply all policy checks to an answer.
         
         Args:
             answer: IFRS answer to validate
+            mode: "fast" stops at the first failing check; "full" runs every
+                check and reports all violations
             
         Returns:
             Validated answer or ABSTAIN response with violations
@@ -191,23 +349,14 @@ class PolicyGuard:
         Raises:
             PolicyError: If policy violations are detected
         """
-        all_violations = []
-        
-        # Validate language
-        language_violations = self.validate_language(answer.answer)
-        all_violations.extend(language_violations)
-        
-        # Validate citations
-        citation_violations = self.validate_citations(answer)
-        all_violations.extend(citation_violations)
-        
-        # Validate confidence
-        confidence_violations = self.validate_confidence(answer)
-        all_violations.extend(confidence_violations)
-        
-        # Validate content
-        content_violations = self.validate_content(answer)
-        all_violations.extend(content_violations)
+        if mode == "fast":
+            all_violations = self._first_violations(answer)
+        else:
+            all_violations = []
+            
+            # Validate language, citations, confidence and content
+            for violations in self._validate_all(answer):
+                all_violations.extend(violations)
         
         # If violations found, convert to ABSTAIN
         if all_violations:
@@ -228,24 +377,46 @@ class PolicyGuard:
         Returns:
             Compliance check results
         """
+        # Run each validator once and derive the summary fields from the results
+        (language_violations, citation_violations,
+         confidence_violations, content_violations) = self._validate_all(answer)
+        
+        total_violations = (
+            len(language_violations) + len(citation_violations) +
+            len(confidence_violations) + len(content_violations)
+        )
+        
         return {
-            "is_compliant": len(self.validate_language(answer.answer)) == 0 and
-                           len(self.validate_citations(answer)) == 0 and
-                           len(self.validate_confidence(answer)) == 0 and
-                           len(self.validate_content(answer)) == 0,
-            "language_violations": self.validate_language(answer.answer),
-            "citation_violations": self.validate_citations(answer),
-            "confidence_violations": self.validate_confidence(answer),
-            "content_violations": self.validate_content(answer),
-            "total_violations": len(self.validate_language(answer.answer)) +
-                              len(self.validate_citations(answer)) +
-                              len(self.validate_confidence(answer)) +
-                              len(self.validate_content(answer))
+            "is_compliant": total_violations == 0,
+            "language_violations": language_violations,
+            "citation_violations": citation_violations,
+            "confidence_violations": confidence_violations,
+            "content_violations": content_violations,
+            "total_violations": total_violations
         }
 
 
-# Global policy guard instance
-policy_guard = PolicyGuard()
+# Global policy guard instance, built on first use so importing this module
+# does no file I/O or regex compilation
+_policy_guard: Optional[PolicyGuard] = None
+_policy_guard_lock = threading.Lock()
+
+
+def _get_guard() -> PolicyGuard:
+    """Return the shared PolicyGuard, building it on first use."""
+    global _policy_guard
+    if _policy_guard is None:
+        with _policy_guard_lock:
+            if _policy_guard is None:
+                _policy_guard = PolicyGuard()
+    return _policy_guard
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `policy_guard` importable from this module
+    if name == "policy_guard":
+        return _get_guard()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def validate_language(text: str) -> List[str]:
@@ -257,19 +428,20 @@ def validate_language(text: str) -> List[str]:
     Returns:
         List of violations
     """
-    return policy_guard.validate_language(text)
+    return _get_guard().validate_language(text)
 
 
-def apply_policy(answer: IFRSAnswer) -> IFRSAnswer:
+def apply_policy(answer: IFRSAnswer, mode: str = "fast") -> IFRSAnswer:
     """Apply policy guardrails to an answer.
     
     Args:
         answer: IFRS answer to validate
+        mode: "fast" stops at the first failing check; "full" reports all
         
     Returns:
         Validated answer or ABSTAIN response
     """
-    return policy_guard.apply_policy(answer)
+    return _get_guard().apply_policy(answer, mode)
 
 
 def check_policy_compliance(answer: IFRSAnswer) -> Dict[str, Any]:
@@ -281,4 +453,4 @@ def check_policy_compliance(answer: IFRSAnswer) -> Dict[str, Any]:
     Returns:
         Compliance check results
     """
-    return policy_guard.check_policy_compliance(answer)
+    return _get_guard().check_policy_compliance(answer)
@@ -1,18 +1,44 @@
 """IFRS question-answering agent with RAG capabilities."""
 
 import json
-import re
-from typing import List, Dict, Any, Optional, Literal
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Literal, Tuple, Union
 from app.settings import settings
-from app.rag.retriever import build_retriever
+from app.rag.retriever import build_retriever, build_batch_retriever
 from app.rag.topics import build_topic_retriever
+from app.rag.store import get_collection_version
+from app.rag.embed import embed_batch
 from app.agents.schemas import IFRSAnswer, Citation
 from app.agents.prompts import create_question_prompt, get_abstain_prompt
+from app.agents.answer_cache import SemanticAnswerCache
+
+# Questions repeat across users, so answers are kept in an LRU keyed on the
+# normalized question. With IFRS_SEMCACHE_TAU set, near-identical questions
+# also reuse answers. Both caches are dropped when the collection changes.
+ANSWER_CACHE_SIZE = 512
+_answer_cache: "OrderedDict[tuple, IFRSAnswer]" = OrderedDict()
+_proximity_caches: Dict[tuple, SemanticAnswerCache] = {}
+_cache_version: Optional[tuple] = None
+_answer_cache_lock = threading.Lock()
+
+# Shared stand-in for documents without metadata; never modified
+_EMPTY_METADATA: Dict[str, Any] = {}
+
+# Abstain answers differ only in their text; copying this validated template
+# is cheaper than constructing a new model each time
+_ABSTAIN_TEMPLATE = IFRSAnswer(status="ABSTAIN", answer="", citations=[], confidence=0.0)
 
 
 def answer_ifrs(question: str, standard_filter: Optional[str] = None, topic: Optional[Literal["ifrs9_impairment", "ifrs16_leases", "ifrs13_measurement"]] = None) -> IFRSAnswer:
     """Answer an IFRS question using RAG.
     
+    Answers to repeated questions are served from cache until the document
+    collection changes.
+    
     Args:
         question: User's question about IFRS
         standard_filter: Optional filter by IFRS standard
@@ -21,129 +47,312 @@ def answer_ifrs(question: str, standard_filter: Optional[str] = None, topic: Opt
     Returns:
         Structured IFRS answer with citations and confidence
     """
+    # Retrieval lowercases the query, so the normalized question answers the same
+    key = (question.strip().lower(), standard_filter, topic)
+    version = get_collection_version()
+    answer, vector = _lookup_cached_answer(key, version)
+    if answer is None:
+        answer = _answer_ifrs_uncached(question, standard_filter, topic)
+        _store_answer(key, version, vector, answer)
+    
+    # Answers and citations are frozen; only the citation list needs its own
+    # copy to keep the cached answer intact
+    return answer.model_copy(update={"citations": list(answer.citations)})
+
+
+def _lookup_cached_answer(key: tuple, version: tuple) -> Tuple[Optional[IFRSAnswer], Optional[np.ndarray]]:
+    """Look a question up in the exact and proximity answer caches.
+    
+    Args:
+        key: (normalized question, standard filter, topic)
+        version: Current collection version; a change empties the caches
+        
+    Returns:
+        Tuple of (cached answer or None, question embedding if the proximity
+        cache is enabled)
+    """
+    return _lookup_cached_answers([key], version)[0]
+
+
+def _lookup_cached_answers(keys: List[tuple], version: tuple) -> List[Tuple[Optional[IFRSAnswer], Optional[np.ndarray]]]:
+    """Look several questions up in the answer caches.
+    
+    Questions missing from the exact cache are embedded together in one call
+    before the proximity lookup.
+    
+    Args:
+        keys: (normalized question, standard filter, topic) per question
+        version: Current collection version; a change empties the caches
+        
+    Returns:
+        One (cached answer or None, question embedding or None) per key
+    """
+    global _cache_version
+    results: List[Tuple[Optional[IFRSAnswer], Optional[np.ndarray]]] = [(None, None)] * len(keys)
+    misses = []
+    with _answer_cache_lock:
+        if version != _cache_version:
+            _answer_cache.clear()
+            _proximity_caches.clear()
+            _cache_version = version
+        for i, key in enumerate(keys):
+            answer = _answer_cache.get(key)
+            if answer is not None:
+                _answer_cache.move_to_end(key)
+                results[i] = (answer, None)
+            else:
+                misses.append(i)
+    
+    if settings.IFRS_SEMCACHE_TAU <= 0 or not misses:
+        return results
+    vectors = embed_batch([keys[i][0] for i in misses])
+    for i, embedding in zip(misses, vectors):
+        vector = SemanticAnswerCache.normalize(embedding)
+        if vector is None:
+            continue
+        with _answer_cache_lock:
+            proximity_cache = _proximity_caches.get(keys[i][1:])
+        results[i] = ((proximity_cache.get(vector) if proximity_cache is not None else None), vector)
+    return results
+
+
+def _store_answer(key: tuple, version: tuple, vector: Optional[np.ndarray], answer: IFRSAnswer) -> None:
+    """Record a freshly computed answer, unless the collection changed meanwhile."""
+    # ABSTAIN can come from a transient retrieval failure, so only substantive
+    # answers are cached
+    if answer.status == "ABSTAIN":
+        return
+    with _answer_cache_lock:
+        if version != _cache_version:
+            return
+        _answer_cache[key] = answer
+        if len(_answer_cache) > ANSWER_CACHE_SIZE:
+            _answer_cache.popitem(last=False)
+        if vector is not None:
+            proximity_cache = _proximity_caches.get(key[1:])
+            if proximity_cache is None:
+                proximity_cache = _proximity_caches[key[1:]] = SemanticAnswerCache(settings.IFRS_SEMCACHE_TAU)
+    if vector is not None:
+        proximity_cache.add(vector, answer)
+
+
+def _answer_ifrs_uncached(question: str, standard_filter: Optional[str] = None, topic: Optional[str] = None) -> IFRSAnswer:
+    """Answer an IFRS question with a fresh retrieval."""
     try:
         # Build retriever based on topic or use default
         if topic:
-            retriever = build_topic_retriever(topic)
-        else:
-            retriever = build_retriever(k=6, score_threshold=0.2)
+            retriever = _get_topic_retriever(topic)
+            return _answer_from_documents(question, retriever(question), standard_filter)
         
-        # Retrieve relevant documents
-        documents = retriever(question)
+        # The default retriever applies the standard filter while ranking, so
+        # the top k are all from the wanted standard
+        retriever = _get_default_retriever(k=6, score_threshold=0.2, standard_filter=standard_filter)
+        return _answer_from_documents(question, retriever(question))
         
-        # Filter by standard if specified
-        if standard_filter:
-            documents = [
-                doc for doc in documents 
-                if doc.get("standard", "").lower() == standard_filter.lower()
-            ]
-        
-        # Check if we have sufficient sources
-        if not documents or len(documents) == 0:
-            return _create_abstain_response(
-                question, 
-                "No relevant IFRS documents found. Please upload IFRS standards first."
-            )
+    except Exception as e:
+        return _create_abstain_response(
+            question,
+            f"Error processing question: {str(e)}"
+        )
+
+
+def answer_ifrs_batch(questions: List[str], standard_filter: Optional[str] = None, max_workers: int = 1) -> List[IFRSAnswer]:
+    """Answer several IFRS questions with a single retrieval pass.
+    
+    Cached answers are reused; the remaining questions are retrieved together.
+    
+    Args:
+        questions: User questions about IFRS
+        standard_filter: Optional filter by IFRS standard
+        max_workers: Number of threads used for the per-question LLM step
         
-        # Check if sources are too weak
-        avg_score = sum(doc.get("score", 0) for doc in documents) / len(documents)
-        if avg_score < 0.2:
+    Returns:
+        One structured IFRS answer per question, in the same order
+    """
+    keys = [(question.strip().lower(), standard_filter, None) for question in questions]
+    version = get_collection_version()
+    cached = _lookup_cached_answers(keys, version)
+    answers: List[Optional[IFRSAnswer]] = [answer for answer, _ in cached]
+    pending = [i for i, answer in enumerate(answers) if answer is None]
+    
+    if pending:
+        fresh = _answer_ifrs_batch_uncached([questions[i] for i in pending], standard_filter, max_workers)
+        for i, answer in zip(pending, fresh):
+            _store_answer(keys[i], version, cached[i][1], answer)
+            answers[i] = answer
+    
+    return [answer.model_copy(update={"citations": list(answer.citations)}) for answer in answers]
+
+
+def _answer_ifrs_batch_uncached(questions: List[str], standard_filter: Optional[str], max_workers: int) -> List[IFRSAnswer]:
+    """Answer several IFRS questions with one fresh retrieval pass."""
+    try:
+        retriever = _get_batch_retriever(k=6, score_threshold=0.2, standard_filter=standard_filter)
+        documents_per_question = retriever(questions)
+    except Exception as e:
+        return [
+            _create_abstain_response(question, f"Error processing question: {str(e)}")
+            for question in questions
+        ]
+    
+    def answer_one(pair) -> IFRSAnswer:
+        question, documents = pair
+        try:
+            return _answer_from_documents(question, documents)
+        except Exception as e:
             return _create_abstain_response(
                 question,
-                f"Retrieved sources are not sufficiently relevant (avg score: {avg_score:.2f}). Please provide more specific question or upload relevant IFRS documents."
+                f"Error processing question: {str(e)}"
             )
+    
+    pairs = list(zip(questions, documents_per_question))
+    if max_workers <= 1 or len(pairs) <= 1:
+        return [answer_one(pair) for pair in pairs]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+        return list(executor.map(answer_one, pairs))
+
+
+@lru_cache(maxsize=8)
+def _get_default_retriever(k: int, score_threshold: float, standard_filter: Optional[str] = None):
+    """Build the default retriever once per configuration.
+    
+    Retrievers hold no per-query state, so one instance is shared by all
+    threads.
+    """
+    return build_retriever(k=k, score_threshold=score_threshold,
+                           metadata_filter=_standard_metadata_filter(standard_filter))
+
+
+@lru_cache(maxsize=8)
+def _get_batch_retriever(k: int, score_threshold: float, standard_filter: Optional[str] = None):
+    """Build the batch retriever once per configuration."""
+    return build_batch_retriever(k=k, score_threshold=score_threshold,
+                                 metadata_filter=_standard_metadata_filter(standard_filter))
+
+
+def _standard_metadata_filter(standard_filter: Optional[str]) -> Optional[Dict[str, str]]:
+    """Retriever metadata filter for an optional IFRS standard."""
+    return {"standard": standard_filter} if standard_filter else None
+
+
+@lru_cache(maxsize=8)
+def _get_topic_retriever(topic: str):
+    """Build a topic retriever once per topic."""
+    return build_topic_retriever(topic)
+
+
+def _answer_from_documents(question: str, documents: List[Dict[str, Any]], standard_filter: Optional[str] = None) -> IFRSAnswer:
+    """Answer a question from already retrieved documents.
+    
+    Args:
+        question: User's question about IFRS
+        documents: Retrieved documents
+        standard_filter: Optional filter by IFRS standard, for retrievers
+            that cannot apply it themselves
         
-        # Create prompt with retrieved documents
-        prompt = create_question_prompt(question, documents)
-        
-        # For now, use a simple rule-based approach since we don't have LLM access
-        # In production, this would call the actual LLM
-        answer = _generate_answer_with_llm(prompt, documents)
-        
-        # Parse the response
-        return _parse_llm_response(answer, documents)
-        
-    except Exception as e:
+    Returns:
+        Structured IFRS answer with citations and confidence
+    """
+    # Filter by standard if specified
+    if standard_filter:
+        documents = [
+            doc for doc in documents 
+            if doc.get("standard", "").lower() == standard_filter.lower()
+        ]
+    
+    # Check if we have sufficient sources
+    if not documents or len(documents) == 0:
+        return _create_abstain_response(
+            question, 
+            "No relevant IFRS documents found. Please upload IFRS standards first."
+        )
+    
+    # Check if sources are too weak; the mean also becomes the confidence
+    avg_score = _average_score(documents)
+    if avg_score < 0.2:
         return _create_abstain_response(
             question,
-            f"Error processing question: {str(e)}"
+            f"Retrieved sources are not sufficiently relevant (avg score: {avg_score:.2f}). Please provide more specific question or upload relevant IFRS documents."
         )
+    
+    # Create prompt with retrieved documents
+    prompt = create_question_prompt(question, documents)
+    
+    # For now, use a simple rule-based approach since we don't have LLM access
+    # In production, this would call the actual LLM
+    answer = _generate_answer_with_llm(prompt, documents, avg_score)
+    
+    # Parse the response
+    return _parse_llm_response(answer, documents, avg_score)
 
 
-def _generate_answer_with_llm(prompt: str, documents: List[Dict[str, Any]]) -> str:
+def _generate_answer_with_llm(prompt: str, documents: List[Dict[str, Any]], avg_score: Optional[float] = None) -> Dict[str, Any]:
     """Generate answer using LLM (mock implementation for now).
     
     Args:
         prompt: Complete prompt for the LLM
         documents: Retrieved documents
+        avg_score: Mean document score, if already computed
         
     Returns:
-        LLM response
+        LLM response, already decoded, since the mock has no text to parse
     """
     # Mock LLM response for testing
     # In production, this would call OpenAI/Azure LLM
     
     # Simple rule-based response for testing
     if not documents:
-        return json.dumps({
+        return {
             "status": "ABSTAIN",
             "answer": "No relevant sources found.",
             "citations": [],
             "confidence": 0.0
-        })
+        }
     
-    # Create citations from documents with provenance
+    # One pass over the top 3 documents: each gives a citation with
+    # provenance, and the top 2 also give an answer excerpt
     citations = []
-    for doc in documents[:3]:  # Use top 3 documents
-        metadata = doc.get("metadata", {})
-        citation = {
-            "standard": metadata.get("standard", "IFRS"),
-            "paragraph": metadata.get("paragraph", "N/A"),
-            "section": metadata.get("section", "N/A"),
-            "document_id": metadata.get("document_id", "unknown"),
-            "chunk_id": metadata.get("chunk_id", "unknown")
-        }
-        citations.append(citation)
+    answer_parts = ["Based on the retrieved IFRS documentation, here is the relevant information:"]
+    for i, doc in enumerate(documents[:3], 1):
+        citations.append(_citation_fields(doc.get("metadata") or _EMPTY_METADATA, section_default="N/A"))
+        
+        if i <= 2:
+            # Truncate content for response
+            answer_parts.append(f"Source {i}: {_truncate(doc.get('content', ''), 200)}")
     
     # Calculate confidence based on document scores
-    scores = [doc.get("score", 0) for doc in documents]
-    confidence = sum(scores) / len(scores) if scores else 0.0
-    
-    # Simple answer generation
-    answer_text = f"Based on the retrieved IFRS documentation, here is the relevant information:"
-    
-    for i, doc in enumerate(documents[:2], 1):
-        content = doc.get("content", "")
-        # Truncate content for response
-        if len(content) > 200:
-            content = content[:200] + "..."
-        answer_text += f"\n\nSource {i}: {content}"
+    confidence = avg_score if avg_score is not None else _average_score(documents)
+    answer_text = "\n\n".join(answer_parts)
     
-    return json.dumps({
+    return {
         "status": "OK" if confidence >= 0.65 else "ABSTAIN",
         "answer": answer_text,
         "citations": citations,
         "confidence": confidence
-    })
+    }
 
 
-def _parse_llm_response(response: str, documents: List[Dict[str, Any]]) -> IFRSAnswer:
+def _parse_llm_response(response: Union[str, Dict[str, Any]], documents: List[Dict[str, Any]], avg_score: Optional[float] = None) -> IFRSAnswer:
     """Parse LLM response into IFRSAnswer.
     
     Args:
-        response: LLM response string
+        response: LLM response string, or an already decoded response
         documents: Retrieved documents for fallback
+        avg_score: Mean document score, if already computed
         
     Returns:
         Parsed IFRSAnswer
     """
     try:
         # Try to parse JSON response
-        if response.strip().startswith('{'):
+        if isinstance(response, dict):
+            data = response
+        elif response.strip().startswith('{'):
             data = json.loads(response)
         else:
             # Fallback: create response from documents
-            return _create_fallback_response(documents)
+            return _create_fallback_response(documents, avg_score)
         
         # Extract fields
         status = data.get("status", "ABSTAIN")
@@ -153,14 +362,7 @@ def _parse_llm_response(response: str, documents: List[Dict[str, Any]]) -> IFRSA
         # Parse citations with provenance
         citations = []
         for cit_data in data.get("citations", []):
-            citation = Citation(
-                standard=cit_data.get("standard", "IFRS"),
-                paragraph=cit_data.get("paragraph", "N/A"),
-                section=cit_data.get("section"),
-                document_id=cit_data.get("document_id", "unknown"),
-                chunk_id=cit_data.get("chunk_id", "unknown")
-            )
-            citations.append(citation)
+            citations.append(Citation(**_citation_fields(cit_data)))
         
         # Validate confidence and status
         if confidence < 0.5 or not citations:
@@ -179,14 +381,15 @@ def _parse_llm_response(response: str, documents: List[Dict[str, Any]]) -> IFRSA
         
     except (json.JSONDecodeError, KeyError, ValueError) as e:
         # Fallback to document-based response
-        return _create_fallback_response(documents)
+        return _create_fallback_response(documents, avg_score)
 
 
-def _create_fallback_response(documents: List[Dict[str, Any]]) -> IFRSAnswer:
+def _create_fallback_response(documents: List[Dict[str, Any]], avg_score: Optional[float] = None) -> IFRSAnswer:
     """Create fallback response from documents.
     
     Args:
         documents: Retrieved documents
+        avg_score: Mean document score, if already computed
         
     Returns:
         IFRSAnswer with document-based response
@@ -194,32 +397,20 @@ def _create_fallback_response(documents: List[Dict[str, Any]]) -> IFRSAnswer:
     if not documents:
         return _create_abstain_response("", "No relevant documents found")
     
-    # Create citations from documents with provenance
+    # One pass over the top 3 documents: each gives a citation with
+    # provenance, and the top 2 also give an answer excerpt
     citations = []
-    for doc in documents[:3]:
-        metadata = doc.get("metadata", {})
-        citation = Citation(
-            standard=metadata.get("standard", "IFRS"),
-            paragraph=metadata.get("paragraph", "N/A"),
-            section=metadata.get("section"),
-            document_id=metadata.get("document_id", "unknown"),
-            chunk_id=metadata.get("chunk_id", "unknown")
-        )
-        citations.append(citation)
-    
-    # Calculate confidence
-    scores = [doc.get("score", 0) for doc in documents]
-    confidence = sum(scores) / len(scores) if scores else 0.0
-    
-    # Create answer from document content
     answer_parts = []
-    for i, doc in enumerate(documents[:2], 1):
-        content = doc.get("content", "")
+    for i, doc in enumerate(documents[:3], 1):
+        citations.append(Citation(**_citation_fields(doc.get("metadata") or _EMPTY_METADATA)))
+        
+        content = doc.get("content", "") if i <= 2 else ""
         if content:
             # Truncate long content
-            if len(content) > 300:
-                content = content[:300] + "..."
-            answer_parts.append(f"Source {i}: {content}")
+            answer_parts.append(f"Source {i}: {_truncate(content, 300)}")
+    
+    # Calculate confidence
+    confidence = avg_score if avg_score is not None else _average_score(documents)
     
     answer = "Based on the available IFRS documentation:\n\n" + "\n\n".join(answer_parts)
     
@@ -231,6 +422,36 @@ def _create_fallback_response(documents: List[Dict[str, Any]]) -> IFRSAnswer:
     )
 
 
+def _citation_fields(source: Dict[str, Any], section_default: Optional[str] = None) -> Dict[str, Any]:
+    """Read the citation fields, with their defaults, from metadata or a parsed citation.
+    
+    Args:
+        source: Document metadata or a citation from the LLM response
+        section_default: Section to use when the source has none
+        
+    Returns:
+        Citation fields with provenance, in citation order
+    """
+    get = source.get
+    return {
+        "standard": get("standard", "IFRS"),
+        "paragraph": get("paragraph", "N/A"),
+        "section": get("section", section_default),
+        "document_id": get("document_id", "unknown"),
+        "chunk_id": get("chunk_id", "unknown")
+    }
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis."""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _average_score(documents: List[Dict[str, Any]]) -> float:
+    """Mean retrieval score of the documents, or 0.0 if there are none."""
+    return sum(doc.get("score", 0) for doc in documents) / len(documents) if documents else 0.0
+
+
 def _create_abstain_response(question: str, reason: str) -> IFRSAnswer:
     """Create an abstain response.
     
@@ -241,9 +462,6 @@ def _create_abstain_response(question: str, reason: str) -> IFRSAnswer:
     Returns:
         IFRSAnswer with ABSTAIN status
     """
-    return IFRSAnswer(
-        status="ABSTAIN",
-        answer=f"Cannot answer: {reason}",
-        citations=[],
-        confidence=0.0
+    return _ABSTAIN_TEMPLATE.model_copy(
+        update={"answer": f"Cannot answer: {reason}", "citations": []}
     )
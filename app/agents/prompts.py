@@ -3,9 +3,7 @@
 from typing import List, Dict, Any
 
 
-def get_system_prompt() -> str:
-    """Get the system prompt for IFRS assistant."""
-    return """You are an expert IFRS assistant specializing in IFRS 9, IFRS 13, and IFRS 16 standards. 
+_SYSTEM_PROMPT = """You are an expert IFRS assistant specializing in IFRS 9, IFRS 13, and IFRS 16 standards. 
 
 Your role is to provide accurate, well-sourced answers about International Financial Reporting Standards using only the retrieved document sources provided to you.
 
@@ -37,6 +35,40 @@ CONFIDENCE GUIDELINES:
 Always prioritize accuracy over completeness. When in doubt, abstain and ask for clarification."""
 
 
+def get_system_prompt() -> str:
+    """Get the system prompt for IFRS assistant."""
+    return _SYSTEM_PROMPT
+
+
+# The fixed parts of the question prompt, around the sources and the question
+_QUESTION_PROMPT_HEAD = _SYSTEM_PROMPT + "\n\nRETRIEVED SOURCES:\n"
+_QUESTION_PROMPT_TAIL = """
+
+Please provide a structured JSON response with the following format:
+{
+    "status": "OK" or "ABSTAIN",
+    "answer": "Your detailed response or abstention reason",
+    "citations": [
+        {
+            "standard": "IFRS 9",
+            "paragraph": "4.1.1",
+            "section": "Recognition and Measurement"
+        }
+    ],
+    "confidence": 0.85
+}
+
+Remember: Only use information from the provided sources. If the sources don't contain sufficient information to answer the question confidently, set status to "ABSTAIN" and explain what additional information would be needed."""
+
+
+_DOC_TEMPLATE = """Document {index} (Relevance: {score:.2f}):
+Standard: {standard}
+Section: {section}
+Paragraph: {paragraph}
+Pages: {page_from}-{page_to}
+Content: {content}"""
+
+
 def format_retrieved_documents(documents: List[Dict[str, Any]]) -> str:
     """Format retrieved documents for the prompt.
     
@@ -49,30 +81,24 @@ def format_retrieved_documents(documents: List[Dict[str, Any]]) -> str:
     if not documents:
         return "No relevant documents found."
     
-    formatted_docs = []
-    for i, doc in enumerate(documents, 1):
-        content = doc.get("content", "")
-        metadata = doc.get("metadata", {})
-        score = doc.get("score", 0.0)
-        
-        # Extract metadata
-        standard = metadata.get("standard", "Unknown")
-        section = metadata.get("section", "Unknown")
-        paragraph = metadata.get("paragraph", "Unknown")
-        page_from = metadata.get("page_from", 0)
-        page_to = metadata.get("page_to", 0)
-        
-        # Format document
-        doc_text = f"""Document {i} (Relevance: {score:.2f}):
-Standard: {standard}
-Section: {section}
-Paragraph: {paragraph}
-Pages: {page_from}-{page_to}
-Content: {content[:500]}{'...' if len(content) > 500 else ''}"""
-        
-        formatted_docs.append(doc_text)
-    
-    return "\n\n".join(formatted_docs)
+    return "\n\n".join(_format_document(index, doc) for index, doc in enumerate(documents, 1))
+
+
+def _format_document(index: int, doc: Dict[str, Any]) -> str:
+    """Format one retrieved document, truncating its content."""
+    content = doc.get("content", "")
+    metadata = doc.get("metadata", {})
+    body = content[:500] + "..." if len(content) > 500 else content
+    return _DOC_TEMPLATE.format(
+        index=index,
+        score=doc.get("score", 0.0),
+        standard=metadata.get("standard", "Unknown"),
+        section=metadata.get("section", "Unknown"),
+        paragraph=metadata.get("paragraph", "Unknown"),
+        page_from=metadata.get("page_from", 0),
+        page_to=metadata.get("page_to", 0),
+        content=body
+    )
 
 
 def create_question_prompt(question: str, documents: List[Dict[str, Any]]) -> str:
@@ -85,33 +111,10 @@ def create_question_prompt(question: str, documents: List[Dict[str, Any]]) -> st
     Returns:
         Complete prompt for the LLM
     """
-    system_prompt = get_system_prompt()
-    formatted_docs = format_retrieved_documents(documents)
-    
-    prompt = f"""{system_prompt}
-
-RETRIEVED SOURCES:
-{formatted_docs}
-
-USER QUESTION: {question}
-
-Please provide a structured JSON response with the following format:
-{{
-    "status": "OK" or "ABSTAIN",
-    "answer": "Your detailed response or abstention reason",
-    "citations": [
-        {{
-            "standard": "IFRS 9",
-            "paragraph": "4.1.1",
-            "section": "Recognition and Measurement"
-        }}
-    ],
-    "confidence": 0.85
-}}
-
-Remember: Only use information from the provided sources. If the sources don't contain sufficient information to answer the question confidently, set status to "ABSTAIN" and explain what additional information would be needed."""
-    
-    return prompt
+    return "".join((
+        _QUESTION_PROMPT_HEAD, format_retrieved_documents(documents),
+        "\n\nUSER QUESTION: ", question, _QUESTION_PROMPT_TAIL
+    ))
 
 
 def get_abstain_prompt(question: str, reason: str = "insufficient sources") -> str:
@@ -1,12 +1,15 @@
 """Pydantic schemas for IFRS agent responses."""
 
 from typing import List, Literal, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Citation(BaseModel):
     """Citation reference to IFRS document."""
     
+    # Immutable, so answers and caches can share citation instances
+    model_config = ConfigDict(frozen=True)
+    
     standard: str = Field(..., description="IFRS standard (e.g., 'IFRS 9', 'IFRS 13')")
     paragraph: Union[str, int] = Field(..., description="Paragraph number or reference")
     section: Optional[str] = Field(None, description="Section title or reference")
@@ -15,6 +18,8 @@ class Citation(BaseModel):
 class IFRSAnswer(BaseModel):
     """Structured response from IFRS agent."""
     
+    model_config = ConfigDict(frozen=True)
+    
     status: Literal["OK", "ABSTAIN"] = Field(..., description="Response status")
     answer: str = Field(..., description="Answer text or abstention reason")
     citations: List[Citation] = Field(default_factory=list, description="Source citations")
@@ -1,11 +1,19 @@
 """Constrained chat agent tools for IFRS and document analysis."""
 
-from typing import List, Dict, Any, Optional
+import heapq
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from app.agents.ifrs import answer_ifrs
 from app.agents.feedback import analyze_document
 from app.agents.schemas import IFRSAnswer
 from app.agents.feedback import Feedback
-from app.rag.store import get_collection, get_vector_store
+from app.rag.store import get_collection_version
+from app.rag.retriever import get_prepared_documents
+
+# Lowercased chunks for tool_search_documents, with the collection version
+# they were built from
+_search_rows: Optional[Tuple[tuple, List[Tuple[str, str, Dict[str, Any]]]]] = None
+_search_rows_lock = threading.Lock()
 
 
 def tool_ifrs_ask(question: str, standard_filter: Optional[str] = None) -> IFRSAnswer:
@@ -51,6 +59,32 @@ def tool_analyze_document(doc_id: str, standard: str = "IFRS 13") -> Feedback:
         )
 
 
+def _searchable_chunks() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Get (doc_id, lowercased content, metadata) for every chunk with a doc_id.
+    
+    The rows are built once per version of the collection, so searches do
+    not reload the collection or lowercase every chunk per query.
+    """
+    global _search_rows
+    version = get_collection_version("ifrs_documents")
+    with _search_rows_lock:
+        cached = _search_rows
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    # Reuse the retriever's lowercased copies rather than making another
+    rows = []
+    for doc, content_lower, _ in get_prepared_documents("ifrs_documents"):
+        metadata = doc.get("metadata", {})
+        doc_id = metadata.get("doc_id", "")
+        if doc_id:
+            rows.append((doc_id, content_lower, metadata))
+    
+    with _search_rows_lock:
+        _search_rows = (version, rows)
+    return rows
+
+
 def tool_search_documents(term: str) -> List[Dict[str, Any]]:
     """Search for documents matching a term.
     
@@ -61,21 +95,15 @@ def tool_search_documents(term: str) -> List[Dict[str, Any]]:
         List of matching documents with metadata
     """
     try:
-        # Get collection
-        client = get_vector_store()
-        collection = get_collection(client, "ifrs_documents")
+        term_lower = term.lower()
         
         # Search for documents containing the term
         matching_docs = []
         seen_doc_ids = set()
         
-        for doc in collection.get("documents", []):
-            content = doc.get("content", "").lower()
-            metadata = doc.get("metadata", {})
-            doc_id = metadata.get("doc_id", "")
-            
+        for doc_id, content, metadata in _searchable_chunks():
             # Check if term appears in content and we haven't seen this doc_id
-            if term.lower() in content and doc_id and doc_id not in seen_doc_ids:
+            if doc_id not in seen_doc_ids and term_lower in content:
                 seen_doc_ids.add(doc_id)
                 
                 # Extract title from content (first line or first 50 chars)
@@ -96,13 +124,11 @@ def tool_search_documents(term: str) -> List[Dict[str, Any]]:
                     "doc_id": doc_id,
                     "title": title,
                     "tags": tags,
-                    "relevance_score": content.count(term.lower()) / len(content) if content else 0
+                    "relevance_score": content.count(term_lower) / len(content) if content else 0
                 })
         
-        # Sort by relevance score
-        matching_docs.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        return matching_docs[:10]  # Return top 10 matches
+        # Top 10 matches by relevance score
+        return heapq.nlargest(10, matching_docs, key=lambda x: x["relevance_score"])
         
     except Exception as e:
         return [{
@@ -1,21 +1,32 @@
 """Audit models for persisting interactions and citations."""
 
 from datetime import datetime
-from typing import Optional, List
-from sqlmodel import SQLModel, Field, Relationship, create_engine, Session
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from typing import Optional, List, Tuple
+from sqlmodel import SQLModel, Field, Relationship, create_engine, Session, select
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, event, func, case
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import relationship, scoped_session, sessionmaker
+
+# Audit writes are small and frequent. WAL lets readers run during writes and,
+# with synchronous=NORMAL, commits no longer fsync the database every time.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
 
 
 class InteractionBase(SQLModel):
     """Base interaction model."""
     
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
     user: str = Field(default="anonymous", description="User identifier")
     question: str = Field(..., description="User question or request")
     intent: str = Field(..., description="Classified intent (ask_ifrs, analyze_doc, search_docs, unknown)")
     response: str = Field(..., description="Generated response text")
-    status: str = Field(..., description="Response status (OK, ABSTAIN, NEEDS_REVIEW)")
+    status: str = Field(..., index=True, description="Response status (OK, ABSTAIN, NEEDS_REVIEW)")
     confidence: float = Field(..., description="Confidence score 0-1")
     model: str = Field(default="valuation-agent", description="Model version used")
     vector_dir: str = Field(default="", description="Vector store directory used")
@@ -49,7 +60,7 @@ class InteractionCitation(InteractionCitationBase, table=True):
     __tablename__ = "interaction_citations"
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    interaction_id: int = Field(foreign_key="interactions.id")
+    interaction_id: int = Field(foreign_key="interactions.id", index=True)
     
     # Relationships
     interaction: Optional[Interaction] = Relationship(back_populates="citations")
@@ -67,12 +78,22 @@ class InteractionDocument(InteractionDocumentBase, table=True):
     __tablename__ = "interaction_documents"
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    interaction_id: int = Field(foreign_key="interactions.id")
+    interaction_id: int = Field(foreign_key="interactions.id", index=True)
     
     # Relationships
     interaction: Optional[Interaction] = Relationship(back_populates="documents")
 
 
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply SQLITE_PRAGMAS to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 class AuditDatabase:
     """Audit database manager."""
     
@@ -82,12 +103,33 @@ class AuditDatabase:
         Args:
             database_url: SQLite database URL
         """
-        self.engine = create_engine(database_url, echo=False)
+        url = make_url(database_url)
+        engine_kwargs = {"echo": False}
+        if url.get_backend_name() == "sqlite":
+            # Pooled connections are handed between request threads
+            engine_kwargs["connect_args"] = {"check_same_thread": False}
+        
+        self.engine = create_engine(database_url, **engine_kwargs)
         self.database_url = database_url
+        
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _apply_sqlite_pragmas)
+        
+        # One session per thread, reused across calls instead of built per call
+        self.SessionLocal = scoped_session(
+            sessionmaker(bind=self.engine, class_=Session, expire_on_commit=False)
+        )
     
     def create_tables(self):
-        """Create all audit tables."""
+        """Create all audit tables.
+        
+        Indexes are also created on tables that already exist, so databases
+        created before an index was declared pick it up.
+        """
         SQLModel.metadata.create_all(self.engine)
+        for table in (Interaction.__table__, InteractionCitation.__table__, InteractionDocument.__table__):
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
     
     def get_session(self) -> Session:
         """Get database session.
@@ -95,7 +137,7 @@ class AuditDatabase:
         Returns:
             Database session
         """
-        return Session(self.engine)
+        return self.SessionLocal()
     
     def log_interaction(
         self,
@@ -146,31 +188,27 @@ class AuditDatabase:
                 doc_id=doc_id
             )
             
+            # Flush to get the interaction's ID; everything commits together
             session.add(interaction)
-            session.commit()
-            session.refresh(interaction)
+            session.flush()
             
             interaction_id = interaction.id
             
-            # Add citations if provided
-            if citations:
-                for citation in citations:
-                    citation_record = InteractionCitation(
-                        interaction_id=interaction_id,
-                        standard=citation.get("standard", ""),
-                        paragraph=citation.get("paragraph", ""),
-                        section=citation.get("section")
-                    )
-                    session.add(citation_record)
-            
-            # Add documents if provided
-            if documents:
-                for doc in documents:
-                    doc_record = InteractionDocument(
-                        interaction_id=interaction_id,
-                        doc_id=doc
-                    )
-                    session.add(doc_record)
+            # Add citations and documents if provided
+            records = [
+                InteractionCitation(
+                    interaction_id=interaction_id,
+                    standard=citation.get("standard", ""),
+                    paragraph=citation.get("paragraph", ""),
+                    section=citation.get("section")
+                )
+                for citation in citations or []
+            ]
+            records.extend(
+                InteractionDocument(interaction_id=interaction_id, doc_id=doc)
+                for doc in documents or []
+            )
+            session.add_all(records)
             
             session.commit()
             return interaction_id
@@ -185,7 +223,23 @@ class AuditDatabase:
             List of interactions
         """
         with self.get_session() as session:
-            return session.query(Interaction).order_by(Interaction.timestamp.desc()).limit(limit).all()
+            statement = select(Interaction).order_by(Interaction.timestamp.desc()).limit(limit)
+            return list(session.exec(statement))
+    
+    def get_interactions_brief(self, limit: int = 100) -> List[Tuple[int, datetime, str, float]]:
+        """Get recent interactions as plain rows, without loading ORM objects.
+        
+        Args:
+            limit: Maximum number of interactions to return
+            
+        Returns:
+            List of (id, timestamp, status, confidence) rows
+        """
+        with self.get_session() as session:
+            statement = select(
+                Interaction.id, Interaction.timestamp, Interaction.status, Interaction.confidence
+            ).order_by(Interaction.timestamp.desc()).limit(limit)
+            return list(session.exec(statement))
     
     def get_interaction_stats(self) -> dict:
         """Get interaction statistics.
@@ -194,12 +248,16 @@ class AuditDatabase:
             Statistics dictionary
         """
         with self.get_session() as session:
-            total_interactions = session.query(Interaction).count()
-            ok_responses = session.query(Interaction).filter(Interaction.status == "OK").count()
-            abstain_responses = session.query(Interaction).filter(Interaction.status == "ABSTAIN").count()
-            avg_confidence = session.query(Interaction).with_entities(
-                session.query(Interaction).with_entities(Interaction.confidence).label('avg_conf')
-            ).scalar() or 0.0
+            # One pass over the table for every figure
+            total_interactions, ok_responses, abstain_responses, avg_confidence = session.query(
+                func.count(Interaction.id),
+                func.sum(case((Interaction.status == "OK", 1), else_=0)),
+                func.sum(case((Interaction.status == "ABSTAIN", 1), else_=0)),
+                func.avg(Interaction.confidence)
+            ).one()
+            ok_responses = ok_responses or 0
+            abstain_responses = abstain_responses or 0
+            avg_confidence = avg_confidence or 0.0
             
             return {
                 "total_interactions": total_interactions,
@@ -1,5 +1,7 @@
 """Security utilities for API key validation."""
 
+import hmac
+from functools import lru_cache
 from typing import Optional
 from app.settings import get_settings
 
@@ -22,8 +24,24 @@ def validate_api_key(api_key: Optional[str]) -> bool:
         # If no API key is configured, allow all requests in development
         return True
         
-    return api_key == settings.API_KEY
+    return api_key_matches(api_key, settings.API_KEY)
 
 
+def api_key_matches(api_key: str, configured_key: str) -> bool:
+    """Compare a presented API key with the configured one in constant time.
+    
+    Args:
+        api_key: API key presented by the client
+        configured_key: API key from settings
+        
+    Returns:
+        True if the keys match, False otherwise
+    """
+    # Bytes also avoid compare_digest rejecting non-ASCII str
+    return hmac.compare_digest(api_key.encode(), _encode_configured_key(configured_key))
 
 
+@lru_cache(maxsize=8)
+def _encode_configured_key(configured_key: str) -> bytes:
+    """Encoded configured key; settings rarely change."""
+    return configured_key.encode()
@@ -0,0 +1 @@
+"""MongoDB access for valuation runs, curves and audit logs."""
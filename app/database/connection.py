@@ -2,65 +2,109 @@
 Database connection and session management.
 """
 
-import os
 from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.database.mongo import get_client, get_database_url, close_client, DATABASE_NAME
+from app.database import mongo
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Indexes backing the lookups and sorts in app.database.crud. The id indexes
+# are sparse so documents stored without an id do not collide.
+INDEXES = {
+    "valuation_runs": [
+        IndexModel([("run_id", ASCENDING)], unique=True, sparse=True),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "curves": [
+        IndexModel([("id", ASCENDING)], unique=True, sparse=True),
+        IndexModel([("currency", ASCENDING), ("curve_type", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "audit_logs": [
+        IndexModel([("resource_type", ASCENDING), ("resource_id", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+}
+
 class DatabaseManager:
-    """Manages database connections and operations."""
+    """Manages database connections and operations.
+    
+    The client and database resolve to the running event loop's client, so
+    several loops (workers, test harnesses) never share one.
+    """
     
     def __init__(self):
-        self.client: Optional[AsyncIOMotorClient] = None
-        self.db = None
-        self.database_url = os.environ.get('DATABASE_URL', 'mongodb://localhost:27017')
+        self.connected = False
+        self.database_url = get_database_url()
+    
+    @property
+    def client(self) -> Optional[AsyncIOMotorClient]:
+        """MongoDB client for the running event loop, if connected."""
+        return get_client() if self.connected else None
+    
+    @property
+    def db(self):
+        """Database for the running event loop, if connected."""
+        return get_client()[DATABASE_NAME] if self.connected else None
         
     async def connect(self):
         """Connect to the database."""
         try:
-            if self.database_url.startswith('mongodb://') or self.database_url.startswith('mongodb+srv://'):
-                self.client = AsyncIOMotorClient(self.database_url)
-                self.db = self.client.valuation_db
-                logger.info(f"Connected to MongoDB: {self.database_url}")
-            else:
-                # Fallback to local MongoDB
-                self.client = AsyncIOMotorClient("mongodb://localhost:27017")
-                self.db = self.client.valuation_db
-                logger.info("Connected to local MongoDB")
+            self.ensure_connected()
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
     
+    def ensure_connected(self):
+        """Connect if not connected yet; creating a client needs no await."""
+        if not self.connected:
+            get_client()
+            self.connected = True
+            logger.info(f"Connected to MongoDB: {self.database_url}")
+    
     async def disconnect(self):
         """Disconnect from the database."""
-        if self.client:
-            self.client.close()
+        if self.connected:
+            close_client()
+            self.connected = False
             logger.info("Disconnected from database")
     
+    async def create_indexes(self):
+        """Create the indexes used by the CRUD queries; existing ones are kept."""
+        for collection_name, indexes in INDEXES.items():
+            try:
+                await self.get_collection(collection_name).create_indexes(indexes)
+            except Exception as e:
+                logger.warning(f"Could not create indexes on {collection_name}: {e}")
+    
     def get_collection(self, collection_name: str):
         """Get a collection from the database."""
-        if not self.db:
+        if not self.connected:
             raise Exception("Database not connected")
-        return self.db[collection_name]
+        return mongo.get_collection(collection_name)
 
 # Global database manager instance
 db_manager = DatabaseManager()
 
 async def get_database():
     """Get the database instance."""
-    if not db_manager.db:
+    if not db_manager.connected:
         await db_manager.connect()
     return db_manager.db
 
 async def get_collection(collection_name: str):
     """Get a collection from the database."""
-    if not db_manager.db:
+    if not db_manager.connected:
         await db_manager.connect()
     return db_manager.get_collection(collection_name)
 
-
-
-
+def collection_handle(collection_name: str):
+    """Get a cached collection handle, connecting on first use.
+    
+    Unlike get_collection this needs no await, so CRUD calls skip an
+    event-loop hop.
+    """
+    db_manager.ensure_connected()
+    return mongo.get_collection(collection_name)
@@ -2,14 +2,53 @@
 Database CRUD operations for valuation data.
 """
 
+import asyncio
+from bson import ObjectId
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from app.utils.clock import request_now
 from app.database.models import ValuationRun, Curve, User, AuditLog
-from app.database.connection import get_collection
+from app.database.connection import collection_handle
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Audit entries are buffered and written in bulk, flushing once a batch is
+# full or the interval has passed since its first entry
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.1
+AUDIT_QUEUE_SIZE = 10000
+
+# Fields returned by the list endpoints; full documents carry specs, results
+# and curve nodes that listings do not show
+RUN_SUMMARY_FIELDS = {"run_id": 1, "status": 1, "created_at": 1, "valuation_type": 1}
+CURVE_SUMMARY_FIELDS = {"id": 1, "name": 1, "currency": 1, "curve_type": 1, "as_of_date": 1}
+MAX_LIST_CURVES = 1000
+
+def _run_filter(run_id: str) -> dict:
+    """Filter for a valuation run given its run_id or the ObjectId returned by create_run.
+    
+    ObjectIds go through the _id index, which is smaller than the run_id one.
+    """
+    if ObjectId.is_valid(run_id):
+        return {"_id": ObjectId(run_id)}
+    return {"run_id": run_id}
+
+async def _insert_if_absent(collection, key_field: str, document: dict) -> bool:
+    """Insert a document unless one with the same key exists, in one round trip.
+    
+    Writers should use this instead of checking with find_one before
+    insert_one. Relies on the unique index on key_field.
+    
+    Returns:
+        True if the document was inserted, False if it already existed
+    """
+    result = await collection.update_one(
+        {key_field: document[key_field]},
+        {"$setOnInsert": document},
+        upsert=True
+    )
+    return result.upserted_id is not None
+
 class ValuationRunCRUD:
     """CRUD operations for valuation runs."""
     
@@ -17,7 +56,7 @@ class ValuationRunCRUD:
     async def create_run(run_data: dict) -> str:
         """Create a new valuation run."""
         try:
-            collection = await get_collection("valuation_runs")
+            collection = collection_handle("valuation_runs")
             result = await collection.insert_one(run_data)
             logger.info(f"Created valuation run: {result.inserted_id}")
             return str(result.inserted_id)
@@ -25,25 +64,67 @@ class ValuationRunCRUD:
             logger.error(f"Failed to create valuation run: {e}")
             raise
     
+    @staticmethod
+    async def upsert_run(run_data: dict) -> bool:
+        """Create a valuation run unless one with its run_id exists.
+        
+        Returns:
+            True if the run was created, False if it already existed
+        """
+        try:
+            collection = collection_handle("valuation_runs")
+            return await _insert_if_absent(collection, "run_id", run_data)
+        except Exception as e:
+            logger.error(f"Failed to upsert valuation run {run_data.get('run_id')}: {e}")
+            raise
+    
     @staticmethod
     async def get_run(run_id: str) -> Optional[dict]:
-        """Get a valuation run by ID."""
+        """Get a valuation run by run_id or by the ObjectId returned from create_run."""
         try:
-            collection = await get_collection("valuation_runs")
-            run = await collection.find_one({"run_id": run_id})
+            collection = collection_handle("valuation_runs")
+            run = await collection.find_one(_run_filter(run_id))
             return run
         except Exception as e:
             logger.error(f"Failed to get valuation run {run_id}: {e}")
             return None
     
+    @staticmethod
+    async def get_run_model(run_id: str) -> Optional[ValuationRun]:
+        """Get a valuation run by ID as a validated model.
+        
+        Runs are stored without a separate id, so run_id fills it in.
+        """
+        run = await ValuationRunCRUD.get_run(run_id)
+        if run is None:
+            return None
+        return ValuationRun.model_validate({"id": run["run_id"], **run})
+    
+    @staticmethod
+    async def get_runs(run_ids: List[str]) -> List[dict]:
+        """Get several valuation runs with one query.
+        
+        Runs are returned in the order of run_ids; unknown IDs are skipped.
+        To fetch unrelated documents concurrently, await the single getters
+        together, e.g. asyncio.gather(get_run(a), curves.get_curve(b)).
+        """
+        try:
+            collection = collection_handle("valuation_runs")
+            cursor = collection.find({"run_id": {"$in": list(run_ids)}})
+            by_id = {run["run_id"]: run for run in await cursor.to_list(length=None)}
+            return [by_id[run_id] for run_id in run_ids if run_id in by_id]
+        except Exception as e:
+            logger.error(f"Failed to get valuation runs: {e}")
+            return []
+    
     @staticmethod
     async def update_run(run_id: str, update_data: dict) -> bool:
         """Update a valuation run."""
         try:
-            collection = await get_collection("valuation_runs")
-            update_data["updated_at"] = datetime.utcnow()
+            collection = collection_handle("valuation_runs")
+            update_data["updated_at"] = request_now()
             result = await collection.update_one(
-                {"run_id": run_id}, 
+                _run_filter(run_id), 
                 {"$set": update_data}
             )
             return result.modified_count > 0
@@ -52,16 +133,32 @@ class ValuationRunCRUD:
             return False
     
     @staticmethod
-    async def list_runs(limit: int = 100, skip: int = 0) -> List[dict]:
-        """List valuation runs."""
+    async def list_runs(limit: int = 100, skip: int = 0, projection: Optional[dict] = None) -> List[dict]:
+        """List valuation runs, newest first.
+        
+        Args:
+            limit: Maximum number of runs
+            skip: Number of runs to skip
+            projection: Fields to return; None returns full documents
+        """
         try:
-            collection = await get_collection("valuation_runs")
-            cursor = collection.find().sort("created_at", -1).skip(skip).limit(limit)
+            collection = collection_handle("valuation_runs")
+            cursor = collection.find({}, projection).sort("created_at", -1).skip(skip).limit(limit)
             runs = await cursor.to_list(length=limit)
             return runs
         except Exception as e:
             logger.error(f"Failed to list valuation runs: {e}")
             return []
+    
+    @staticmethod
+    async def list_runs_summary(limit: int = 100, skip: int = 0) -> List[dict]:
+        """List valuation runs with only the RUN_SUMMARY_FIELDS."""
+        return await ValuationRunCRUD.list_runs(limit=limit, skip=skip, projection=RUN_SUMMARY_FIELDS)
+    
+    @staticmethod
+    async def list_runs_full(limit: int = 100, skip: int = 0) -> List[dict]:
+        """List valuation runs as full documents."""
+        return await ValuationRunCRUD.list_runs(limit=limit, skip=skip)
 
 class CurveCRUD:
     """CRUD operations for curves."""
@@ -70,7 +167,7 @@ class CurveCRUD:
     async def create_curve(curve_data: dict) -> str:
         """Create a new curve."""
         try:
-            collection = await get_collection("curves")
+            collection = collection_handle("curves")
             result = await collection.insert_one(curve_data)
             logger.info(f"Created curve: {result.inserted_id}")
             return str(result.inserted_id)
@@ -78,11 +175,25 @@ class CurveCRUD:
             logger.error(f"Failed to create curve: {e}")
             raise
     
+    @staticmethod
+    async def upsert_curve(curve_data: dict) -> bool:
+        """Create a curve unless one with its id exists.
+        
+        Returns:
+            True if the curve was created, False if it already existed
+        """
+        try:
+            collection = collection_handle("curves")
+            return await _insert_if_absent(collection, "id", curve_data)
+        except Exception as e:
+            logger.error(f"Failed to upsert curve {curve_data.get('id')}: {e}")
+            raise
+    
     @staticmethod
     async def get_curve(curve_id: str) -> Optional[dict]:
         """Get a curve by ID."""
         try:
-            collection = await get_collection("curves")
+            collection = collection_handle("curves")
             curve = await collection.find_one({"id": curve_id})
             return curve
         except Exception as e:
@@ -90,22 +201,50 @@ class CurveCRUD:
             return None
     
     @staticmethod
-    async def list_curves(currency: Optional[str] = None, curve_type: Optional[str] = None) -> List[dict]:
-        """List curves with optional filtering."""
+    async def get_curves(curve_ids: List[str]) -> List[dict]:
+        """Get several curves with one query.
+        
+        Curves are returned in the order of curve_ids; unknown IDs are skipped.
+        """
+        try:
+            collection = collection_handle("curves")
+            cursor = collection.find({"id": {"$in": list(curve_ids)}})
+            by_id = {curve["id"]: curve for curve in await cursor.to_list(length=None)}
+            return [by_id[curve_id] for curve_id in curve_ids if curve_id in by_id]
+        except Exception as e:
+            logger.error(f"Failed to get curves: {e}")
+            return []
+    
+    @staticmethod
+    async def list_curves(currency: Optional[str] = None, curve_type: Optional[str] = None,
+                          projection: Optional[dict] = None, limit: int = MAX_LIST_CURVES) -> List[dict]:
+        """List curves with optional filtering, newest first.
+        
+        Args:
+            currency: Only curves in this currency
+            curve_type: Only curves of this type
+            projection: Fields to return; None returns full documents
+            limit: Maximum number of curves
+        """
         try:
-            collection = await get_collection("curves")
+            collection = collection_handle("curves")
             filter_dict = {}
             if currency:
                 filter_dict["currency"] = currency
             if curve_type:
                 filter_dict["curve_type"] = curve_type
             
-            cursor = collection.find(filter_dict).sort("created_at", -1)
-            curves = await cursor.to_list(length=None)
+            cursor = collection.find(filter_dict, projection).sort("created_at", -1).limit(limit)
+            curves = await cursor.to_list(length=limit)
             return curves
         except Exception as e:
             logger.error(f"Failed to list curves: {e}")
             return []
+    
+    @staticmethod
+    async def list_curves_summary(currency: Optional[str] = None, curve_type: Optional[str] = None) -> List[dict]:
+        """List curves with only the CURVE_SUMMARY_FIELDS."""
+        return await CurveCRUD.list_curves(currency=currency, curve_type=curve_type, projection=CURVE_SUMMARY_FIELDS)
 
 class AuditCRUD:
     """CRUD operations for audit logs."""
@@ -116,7 +255,6 @@ class AuditCRUD:
                         user_id: str = "system", ip_address: Optional[str] = None):
         """Log an audit action."""
         try:
-            collection = await get_collection("audit_logs")
             audit_entry = {
                 "action": action,
                 "resource_type": resource_type,
@@ -125,17 +263,93 @@ class AuditCRUD:
                 "new_values": new_values,
                 "created_by": user_id,
                 "ip_address": ip_address,
-                "created_at": datetime.utcnow()
+                "created_at": request_now()
             }
-            await collection.insert_one(audit_entry)
+            if not audit_writer.enqueue(audit_entry):
+                collection = collection_handle("audit_logs")
+                await collection.insert_one(audit_entry)
             logger.info(f"Logged audit action: {action} on {resource_type}:{resource_id}")
         except Exception as e:
             logger.error(f"Failed to log audit action: {e}")
 
+class AuditLogWriter:
+    """Writes queued audit entries to MongoDB in batches with insert_many.
+    
+    Entries are only queued while the writer is running; start it from the
+    application's event loop at startup and stop it at shutdown to flush
+    what is left.
+    """
+    
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+    
+    def start(self):
+        """Start the background flush task on the running event loop."""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Flush queued entries and stop the background task."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(None)
+        await task
+    
+    def enqueue(self, entry: dict) -> bool:
+        """Queue an entry for the next batch.
+        
+        Returns:
+            False if the writer is not running, so the caller writes directly.
+            A full queue drops the entry rather than blocking the request.
+        """
+        if self._task is None:
+            return False
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Audit queue full, dropped entry ({self.dropped} dropped so far)")
+        return True
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            deadline = loop.time() + AUDIT_FLUSH_INTERVAL
+            while len(batch) < AUDIT_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            await self._write(batch)
+    
+    async def _write(self, batch: List[dict]):
+        try:
+            collection = collection_handle("audit_logs")
+            await collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} audit entries: {e}")
+
 # Initialize CRUD instances
 valuation_runs = ValuationRunCRUD()
 curves = CurveCRUD()
 audit = AuditCRUD()
+audit_writer = AuditLogWriter()
 
 
 
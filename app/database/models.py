@@ -4,9 +4,10 @@ Defines all data structures for runs, valuations, curves, and market data.
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
+from app.utils.clock import request_now
 
 class RunStatus(str, Enum):
     """Status of a valuation run."""
@@ -42,17 +43,30 @@ class Currency(str, Enum):
     CAD = "CAD"
     AUD = "AUD"
 
+# Field types for the enums above. Pydantic checks a Literal with a set lookup
+# instead of building an Enum member, and the stored values are the same strings.
+RunStatusValue = Literal["pending", "running", "completed", "failed", "cancelled"]
+ValuationTypeValue = Literal["irs", "ccs", "bond", "swaption", "cap_floor"]
+CurveTypeValue = Literal["ois", "sofr", "euribor", "sonia", "estr"]
+CurrencyCode = Literal["USD", "EUR", "GBP", "JPY", "CHF", "CAD", "AUD"]
+
+# Records are read back from MongoDB and not modified afterwards; freezing
+# them skips assignment validation, and Mongo's _id is ignored
+RECORD_CONFIG = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
 # Base Models
 class BaseRecord(BaseModel):
     """Base record with common fields."""
+    model_config = RECORD_CONFIG
     id: str = Field(..., description="Unique identifier")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=request_now)
+    updated_at: datetime = Field(default_factory=request_now)
     created_by: str = Field(..., description="User who created the record")
 
 # Market Data Models
 class MarketDataPoint(BaseModel):
     """Individual market data point."""
+    model_config = RECORD_CONFIG
     tenor: str = Field(..., description="Tenor (e.g., '1M', '3M', '1Y')")
     rate: float = Field(..., description="Interest rate")
     date: datetime = Field(..., description="Market data date")
@@ -61,8 +75,8 @@ class MarketDataPoint(BaseModel):
 class Curve(BaseRecord):
     """Interest rate curve."""
     name: str = Field(..., description="Curve name")
-    currency: Currency = Field(..., description="Currency")
-    curve_type: CurveType = Field(..., description="Type of curve")
+    currency: CurrencyCode = Field(..., description="Currency")
+    curve_type: CurveTypeValue = Field(..., description="Type of curve")
     as_of_date: datetime = Field(..., description="As of date")
     nodes: List[MarketDataPoint] = Field(default_factory=list)
     status: str = Field(default="active", description="Curve status")
@@ -72,7 +86,7 @@ class Curve(BaseRecord):
 class IRSSpec(BaseModel):
     """Interest Rate Swap specification."""
     notional: float = Field(..., description="Notional amount")
-    currency: Currency = Field(..., description="Currency")
+    currency: CurrencyCode = Field(..., description="Currency")
     pay_fixed: bool = Field(..., description="True if paying fixed rate")
     fixed_rate: Optional[float] = Field(None, description="Fixed rate (if applicable)")
     float_index: str = Field(..., description="Floating rate index")
@@ -89,8 +103,8 @@ class CCSSpec(BaseModel):
     """Cross Currency Swap specification."""
     notional_leg1: float = Field(..., description="Notional for leg 1")
     notional_leg2: float = Field(..., description="Notional for leg 2")
-    currency_leg1: Currency = Field(..., description="Currency for leg 1")
-    currency_leg2: Currency = Field(..., description="Currency for leg 2")
+    currency_leg1: CurrencyCode = Field(..., description="Currency for leg 1")
+    currency_leg2: CurrencyCode = Field(..., description="Currency for leg 2")
     index_leg1: str = Field(..., description="Index for leg 1")
     index_leg2: str = Field(..., description="Index for leg 2")
     effective_date: datetime = Field(..., description="Effective date")
@@ -103,6 +117,7 @@ class CCSSpec(BaseModel):
 
 class PVBreakdown(BaseModel):
     """Present Value breakdown."""
+    model_config = RECORD_CONFIG
     pv_base_currency: float = Field(..., description="PV in base currency")
     pv_reporting_currency: Optional[float] = Field(None, description="PV in reporting currency")
     legs: List[Dict[str, Any]] = Field(default_factory=list, description="PV breakdown by leg")
@@ -112,10 +127,10 @@ class ValuationRun(BaseRecord):
     """Valuation run record."""
     run_id: str = Field(..., description="Unique run identifier")
     as_of_date: datetime = Field(..., description="As of date for valuation")
-    valuation_type: ValuationType = Field(..., description="Type of valuation")
+    valuation_type: ValuationTypeValue = Field(..., description="Type of valuation")
     spec: Dict[str, Any] = Field(..., description="Valuation specification")
     market_data_profile: str = Field(default="synthetic", description="Market data profile used")
-    status: RunStatus = Field(default=RunStatus.PENDING, description="Run status")
+    status: RunStatusValue = Field(default=RunStatus.PENDING.value, description="Run status")
     result: Optional[PVBreakdown] = Field(None, description="Valuation result")
     error_message: Optional[str] = Field(None, description="Error message if failed")
     curve_ids: List[str] = Field(default_factory=list, description="Curve IDs used")
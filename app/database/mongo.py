@@ -0,0 +1,110 @@
+"""
+MongoDB client construction.
+
+Clients are created on first use rather than at import, so importing the
+database package never opens connections. Motor clients are tied to the event
+loop they are first used on, so each running loop gets its own client.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.settings import get_settings
+
+DEFAULT_DATABASE_URL = "mongodb://localhost:27017"
+DATABASE_NAME = "valuation_db"
+
+# Each client is stored with the collection handles taken from it
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncIOMotorClient, Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+_default_client: Optional[Tuple[AsyncIOMotorClient, Dict[str, Any]]] = None
+_clients_lock = threading.Lock()
+
+
+def get_database_url() -> str:
+    """Get the MongoDB URL, falling back to local MongoDB for development."""
+    url = get_settings().DATABASE_URL
+    if url and url.startswith(("mongodb://", "mongodb+srv://")):
+        return url
+    return DEFAULT_DATABASE_URL
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Get the MongoDB client for the running event loop.
+    
+    Outside an event loop a single process-wide client is returned.
+    """
+    return _client_entry()[0]
+
+
+def get_database():
+    """Get MongoDB database instance."""
+    return get_client()[DATABASE_NAME]
+
+
+def get_collection(collection_name: str):
+    """Get a collection of the running loop's client.
+    
+    Handles are created once per client and reused.
+    """
+    client, collections = _client_entry()
+    collection = collections.get(collection_name)
+    if collection is None:
+        collection = collections[collection_name] = client[DATABASE_NAME][collection_name]
+    return collection
+
+
+def close_client() -> None:
+    """Close the running loop's client; the next get_client call creates a new one."""
+    global _default_client
+    loop = _running_loop()
+    with _clients_lock:
+        if loop is None:
+            entry, _default_client = _default_client, None
+        else:
+            entry = _loop_clients.pop(loop, None)
+    if entry is not None:
+        entry[0].close()
+
+
+def _client_entry() -> Tuple[AsyncIOMotorClient, Dict[str, Any]]:
+    global _default_client
+    loop = _running_loop()
+    with _clients_lock:
+        if loop is None:
+            if _default_client is None:
+                _default_client = (_create_client(), {})
+            return _default_client
+        
+        entry = _loop_clients.get(loop)
+        if entry is None:
+            _close_clients_of_closed_loops()
+            entry = _loop_clients[loop] = (_create_client(), {})
+        return entry
+
+
+def _create_client() -> AsyncIOMotorClient:
+    """Create a client with the pool sized from settings."""
+    settings = get_settings()
+    return AsyncIOMotorClient(
+        get_database_url(),
+        maxPoolSize=settings.MONGO_MAX_POOL,
+        minPoolSize=settings.MONGO_MIN_POOL,
+        waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _close_clients_of_closed_loops() -> None:
+    """Drop clients whose loop has closed; caller holds _clients_lock."""
+    for loop in [loop for loop in _loop_clients if loop.is_closed()]:
+        _loop_clients.pop(loop)[0].close()
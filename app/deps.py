@@ -3,6 +3,7 @@
 from typing import Optional
 from fastapi import HTTPException, Depends, Header
 from app.settings import get_settings, Settings
+from app.core.security import api_key_matches
 
 
 def get_api_key(settings: Settings = Depends(get_settings)) -> Optional[str]:
@@ -14,15 +15,25 @@ def get_api_key(settings: Settings = Depends(get_settings)) -> Optional[str]:
     return getattr(settings, 'API_KEY', None)
 
 
+# The API key is read once at startup; call reload_api_key after changing it
+_CONFIGURED_KEY: Optional[str] = get_api_key(get_settings())
+_REQUIRED = bool(_CONFIGURED_KEY)
+
+
+def reload_api_key() -> None:
+    """Re-read the configured API key from settings."""
+    global _CONFIGURED_KEY, _REQUIRED
+    _CONFIGURED_KEY = get_api_key(get_settings())
+    _REQUIRED = bool(_CONFIGURED_KEY)
+
+
 def verify_api_key(
-    x_api_key: Optional[str] = Header(None, alias="X-API-Key"),
-    settings: Settings = Depends(get_settings)
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key")
 ) -> bool:
     """Verify API key from request header.
     
     Args:
         x_api_key: API key from X-API-Key header
-        settings: Application settings
         
     Returns:
         True if API key is valid or not required
@@ -30,11 +41,8 @@ def verify_api_key(
     Raises:
         HTTPException: 401 if API key is required but missing/invalid
     """
-    # Get configured API key
-    configured_key = get_api_key(settings)
-    
     # If no API key is configured, allow all requests
-    if not configured_key:
+    if not _REQUIRED:
         return True
     
     # If API key is configured but not provided, deny access
@@ -45,7 +53,7 @@ def verify_api_key(
         )
     
     # If API key is provided but doesn't match, deny access
-    if x_api_key != configured_key:
+    if not api_key_matches(x_api_key, _CONFIGURED_KEY):
         raise HTTPException(
             status_code=401,
             detail="Invalid API key. Please check your X-API-Key header."
@@ -0,0 +1,30 @@
+"""Middleware that stamps each request with a single timestamp."""
+
+from datetime import datetime, timezone
+from app.utils.clock import REQUEST_NOW
+
+
+class RequestTimeMiddleware:
+    """Sets REQUEST_NOW for the duration of each HTTP request.
+    
+    Plain ASGI rather than BaseHTTPMiddleware, so the context variable is
+    visible to the endpoint and no extra task is created per request.
+    """
+    
+    def __init__(self, app):
+        """Initialize request time middleware.
+        
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = REQUEST_NOW.set(datetime.now(timezone.utc))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            REQUEST_NOW.reset(token)
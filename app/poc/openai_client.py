@@ -1,10 +1,44 @@
 """OpenAI client wrapper for PoC."""
 
 import json
+from functools import lru_cache
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.settings import get_settings
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(data: Any) -> bytes:
+    """Encode data as compact JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+# Only the user message changes between calls, so the request body around it
+# is encoded once per (model, system prompt) and (temperature, max tokens)
+@lru_cache(maxsize=32)
+def _payload_prefix(model: str, system_prompt: str) -> bytes:
+    return (
+        b'{"model":' + _dumps(model)
+        + b',"messages":[{"role":"system","content":' + _dumps(system_prompt)
+        + b'},{"role":"user","content":'
+    )
+
+
+@lru_cache(maxsize=32)
+def _payload_suffix(temperature: float, max_tokens: int) -> bytes:
+    return (
+        b'}],"temperature":' + _dumps(temperature)
+        + b',"max_tokens":' + _dumps(max_tokens)
+        + b',"response_format":{"type":"json_object"}}'
+    )
+
 
 class OpenAIClient:
     """Simple wrapper for OpenAI API calls."""
@@ -16,6 +50,22 @@ class OpenAIClient:
             "Authorization": f"Bearer {self.settings.OPENAI_API_KEY}",
             "Content-Type": "application/json"
         }
+        # Created on first use (outside __init__, which runs at import time)
+        # and reused so TCP/TLS connections to the API are kept alive
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared keep-alive client for the OpenAI API."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
     
     async def call_llm(
         self,
@@ -37,40 +87,34 @@ class OpenAIClient:
         # Ensure temperature is within safe bounds
         temperature = max(0.0, min(0.1, temperature))
         
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(user_json)}
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "response_format": {"type": "json_object"}
-        }
+        payload = (
+            _payload_prefix(model, system_prompt)
+            + _dumps(json.dumps(user_json))
+            + _payload_suffix(temperature, max_tokens)
+        )
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        try:
+            response = await self.http.post(
+                "/chat/completions",
+                headers=self.headers,
+                content=payload
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            content = result["choices"][0]["message"]["content"]
+            
+            # Validate JSON response
             try:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
+                json.loads(content)
+                return content
+            except json.JSONDecodeError:
+                raise ValueError(f"LLM returned invalid JSON: {content}")
                 
-                # Validate JSON response
-                try:
-                    json.loads(content)
-                    return content
-                except json.JSONDecodeError:
-                    raise ValueError(f"LLM returned invalid JSON: {content}")
-                    
-            except httpx.HTTPStatusError as e:
-                raise ValueError(f"OpenAI API error: {e.response.status_code} - {e.response.text}")
-            except httpx.RequestError as e:
-                raise ValueError(f"Request error: {str(e)}")
+        except httpx.HTTPStatusError as e:
+            raise ValueError(f"OpenAI API error: {e.response.status_code} - {e.response.text}")
+        except httpx.RequestError as e:
+            raise ValueError(f"Request error: {str(e)}")
     
     async def call_llm_with_retry(
         self,
@@ -3,6 +3,29 @@
 import re
 from typing import List
 
+# Compiled once at import; redact and guard_language run on every request
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b')
+_IBAN_RE = re.compile(r'\b[A-Z]{2}[0-9]{2}[A-Z0-9]{4}[0-9]{7}([A-Z0-9]?){0,16}\b')
+_CARD_RE = re.compile(r'\b[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}\b')
+_SSN_RE = re.compile(r'\b[0-9]{3}-[0-9]{2}-[0-9]{4}\b')
+
+PROHIBITED_WORDS = (
+    "guaranteed", "always", "certainly", "definitely", "absolutely",
+    "100%", "never fails", "risk-free", "sure thing"
+)
+
+# Overly confident language patterns, as (pattern text, compiled pattern)
+_CONFIDENCE_PATTERNS = tuple(
+    (pattern, re.compile(pattern))
+    for pattern in (
+        r'\b(guarantee|guaranteed)\b',
+        r'\b(always|never)\b',
+        r'\b(certainly|definitely)\b',
+        r'\b(100%|never fails)\b'
+    )
+)
+
 
 def redact(text: str) -> str:
     """Remove PII from text before sending to LLM."""
@@ -10,19 +33,19 @@ def redact(text: str) -> str:
         return text
     
     # Email addresses
-    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL_REDACTED]', text)
+    text = _EMAIL_RE.sub('[EMAIL_REDACTED]', text)
     
     # Phone numbers (various formats)
-    text = re.sub(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b', '[PHONE_REDACTED]', text)
+    text = _PHONE_RE.sub('[PHONE_REDACTED]', text)
     
     # IBAN (basic pattern)
-    text = re.sub(r'\b[A-Z]{2}[0-9]{2}[A-Z0-9]{4}[0-9]{7}([A-Z0-9]?){0,16}\b', '[IBAN_REDACTED]', text)
+    text = _IBAN_RE.sub('[IBAN_REDACTED]', text)
     
     # Credit card numbers (basic pattern)
-    text = re.sub(r'\b[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}[\s-]?[0-9]{4}\b', '[CARD_REDACTED]', text)
+    text = _CARD_RE.sub('[CARD_REDACTED]', text)
     
     # SSN (US format)
-    text = re.sub(r'\b[0-9]{3}-[0-9]{2}-[0-9]{4}\b', '[SSN_REDACTED]', text)
+    text = _SSN_RE.sub('[SSN_REDACTED]', text)
     
     return text
 
@@ -32,26 +55,14 @@ def guard_language(text: str) -> List[str]:
     violations = []
     
     # Prohibited words
-    prohibited_words = [
-        "guaranteed", "always", "certainly", "definitely", "absolutely",
-        "100%", "never fails", "risk-free", "sure thing"
-    ]
-    
     text_lower = text.lower()
-    for word in prohibited_words:
+    for word in PROHIBITED_WORDS:
         if word in text_lower:
             violations.append(f"Prohibited word detected: '{word}'")
     
     # Overly confident language patterns
-    confidence_patterns = [
-        r'\b(guarantee|guaranteed)\b',
-        r'\b(always|never)\b',
-        r'\b(certainly|definitely)\b',
-        r'\b(100%|never fails)\b'
-    ]
-    
-    for pattern in confidence_patterns:
-        if re.search(pattern, text_lower):
+    for pattern, compiled in _CONFIDENCE_PATTERNS:
+        if compiled.search(text_lower):
             violations.append(f"Overly confident language detected: {pattern}")
     
     return violations
@@ -34,9 +34,8 @@ def load_system_prompt() -> str:
         return "You are a constrained valuation assistant. Follow all instructions carefully."
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint showing enabled features."""
+def _build_health_response() -> HealthResponse:
+    """Build the health response from the feature flags in settings."""
     settings = get_settings()
     
     enabled_features = []
@@ -54,6 +53,16 @@ async def health_check():
     )
 
 
+# Feature flags are read once at startup, so the health body is built once too
+_HEALTH_RESPONSE = _build_health_response()
+
+
+@router.get("/health", response_model=HealthResponse)
+async def health_check():
+    """Health check endpoint showing enabled features."""
+    return _HEALTH_RESPONSE
+
+
 @router.post("/parse_contract", response_model=ExtractResponse)
 async def parse_contract(
     request: ExtractRequest = None,
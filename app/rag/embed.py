@@ -1,5 +1,6 @@
 """Embedding utilities for vector storage (simplified version)."""
 
+import numpy as np
 from typing import List, Optional
 from app.settings import settings
 
@@ -76,3 +77,18 @@ def embed_query(query: str) -> List[float]:
         return embeddings_model.embed_query(query)
     except Exception as e:
         raise Exception(f"Error embedding query: {e}")
+
+
+def embed_batch(texts: List[str]) -> np.ndarray:
+    """Embed several texts with a single model call.
+    
+    Args:
+        texts: List of text strings to embed
+        
+    Returns:
+        float32 array of shape (len(texts), dimension)
+        
+    Raises:
+        Exception: If embedding fails
+    """
+    return np.asarray(embed_texts(texts), dtype=np.float32)
@@ -2,17 +2,32 @@
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import heapq
+import threading
+from typing import List, Dict, Any, Optional, Set, Tuple
 from app.settings import settings
+from app.rag.store import get_collection_version
 
+# Lowercased, tokenized documents per collection, with the collection version
+# they were built from
+_prepared_cache: Dict[str, Tuple[tuple, List[Tuple[Dict[str, Any], str, Set[str]]]]] = {}
+_prepared_cache_lock = threading.Lock()
 
-def build_retriever(collection: Optional[str] = None, k: int = 6, score_threshold: float = 0.2):
+
+def build_retriever(
+    collection: Optional[str] = None,
+    k: int = 6,
+    score_threshold: float = 0.2,
+    metadata_filter: Optional[Dict[str, str]] = None
+):
     """Build a document retriever for RAG queries.
     
     Args:
         collection: Collection name (defaults to settings.VECTOR_DIR)
         k: Number of documents to retrieve
         score_threshold: Minimum similarity score threshold
+        metadata_filter: Optional metadata values documents must have
+            (compared case-insensitively); others are not scored
         
     Returns:
         Retriever function that takes a query and returns documents
@@ -30,48 +45,7 @@ def build_retriever(collection: Optional[str] = None, k: int = 6, score_threshol
             List of relevant documents with metadata and scores
         """
         try:
-            # Get vector store path
-            vector_dir = settings.VECTOR_DIR
-            collection_file = os.path.join(vector_dir, f"{collection}.json")
-            
-            if not os.path.exists(collection_file):
-                return []
-            
-            # Load collection
-            with open(collection_file, 'r') as f:
-                collection_data = json.load(f)
-            
-            documents = collection_data.get("documents", [])
-            
-            # Simple text-based retrieval with scoring
-            results = []
-            query_lower = query.lower()
-            
-            for doc in documents:
-                content = doc.get("content", "")
-                metadata = doc.get("metadata", {})
-                
-                # Calculate simple relevance score
-                score = _calculate_relevance_score(query_lower, content)
-                
-                if score >= score_threshold:
-                    results.append({
-                        "content": content,
-                        "metadata": metadata,
-                        "score": score,
-                        "doc_id": metadata.get("doc_id", ""),
-                        "standard": metadata.get("standard", ""),
-                        "section": metadata.get("section", ""),
-                        "paragraph": metadata.get("paragraph", ""),
-                        "page_from": metadata.get("page_from", 0),
-                        "page_to": metadata.get("page_to", 0),
-                        "document_id": metadata.get("document_id", metadata.get("doc_id", "")),
-                        "chunk_id": metadata.get("chunk_id", "")
-                    })
-            
-            # Sort by score and return top k
-            results.sort(key=lambda x: x["score"], reverse=True)
-            return results[:k]
+            return _rank_documents(query, get_prepared_documents(collection), k, score_threshold, metadata_filter)
         
         except Exception as e:
             print(f"Error retrieving documents: {e}")
@@ -80,6 +54,136 @@ def build_retriever(collection: Optional[str] = None, k: int = 6, score_threshol
     return retrieve_documents
 
 
+def build_batch_retriever(
+    collection: Optional[str] = None,
+    k: int = 6,
+    score_threshold: float = 0.2,
+    metadata_filter: Optional[Dict[str, str]] = None
+):
+    """Build a retriever that answers several queries with one collection pass.
+    
+    The collection is loaded, and each document lowercased and tokenized, once
+    per collection version instead of once per query.
+    
+    Args:
+        collection: Collection name (defaults to "ifrs_documents")
+        k: Number of documents to retrieve per query
+        score_threshold: Minimum similarity score threshold
+        metadata_filter: Optional metadata values documents must have
+            (compared case-insensitively)
+        
+    Returns:
+        Retriever function that takes a list of queries and returns one
+        document list per query, in the same order
+    """
+    if collection is None:
+        collection = "ifrs_documents"
+    
+    def retrieve_documents_batch(queries: List[str]) -> List[List[Dict[str, Any]]]:
+        try:
+            prepared = get_prepared_documents(collection)
+            return [_rank_documents(query, prepared, k, score_threshold, metadata_filter) for query in queries]
+        
+        except Exception as e:
+            print(f"Error retrieving documents: {e}")
+            return [[] for _ in queries]
+    
+    return retrieve_documents_batch
+
+
+def get_prepared_documents(collection: str = "ifrs_documents") -> List[Tuple[Dict[str, Any], str, Set[str]]]:
+    """Get a collection's documents with their lowercased content and word sets.
+    
+    Documents are loaded and prepared once per version of the collection
+    file, not on every query. The result is shared and must not be modified.
+    
+    Args:
+        collection: Collection name
+        
+    Returns:
+        List of (document, lowercased content, word set) tuples
+    """
+    version = get_collection_version(collection)
+    with _prepared_cache_lock:
+        cached = _prepared_cache.get(collection)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    prepared = _prepare_documents(_load_collection_documents(collection))
+    with _prepared_cache_lock:
+        _prepared_cache[collection] = (version, prepared)
+    return prepared
+
+
+def _load_collection_documents(collection: str) -> List[Dict[str, Any]]:
+    """Load the documents of a collection from the vector directory."""
+    collection_file = os.path.join(settings.VECTOR_DIR, f"{collection}.json")
+    
+    if not os.path.exists(collection_file):
+        return []
+    
+    with open(collection_file, 'r') as f:
+        collection_data = json.load(f)
+    
+    return collection_data.get("documents", [])
+
+
+def _prepare_documents(documents: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str, Set[str]]]:
+    """Pair each document with its lowercased content and word set."""
+    prepared = []
+    for doc in documents:
+        content_lower = doc.get("content", "").lower()
+        prepared.append((doc, content_lower, set(content_lower.split())))
+    return prepared
+
+
+def _rank_documents(
+    query: str,
+    prepared: List[Tuple[Dict[str, Any], str, Set[str]]],
+    k: int,
+    score_threshold: float,
+    metadata_filter: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    """Score prepared documents against a query and return the top k."""
+    query_lower = query.lower()
+    scored = []
+    wanted = [(key, value.lower()) for key, value in (metadata_filter or {}).items()]
+    
+    for doc, content_lower, content_words in prepared:
+        # Skip documents outside the filter before scoring them
+        if wanted:
+            metadata = doc.get("metadata", {})
+            if any(metadata.get(key, "").lower() != value for key, value in wanted):
+                continue
+        
+        # Calculate simple relevance score
+        score = _score_prepared(query_lower, content_lower, content_words)
+        
+        if score >= score_threshold:
+            scored.append((score, doc))
+    
+    # Select the top k by score with a bounded heap (ties keep collection
+    # order, as a stable sort would), then build results for those only
+    results = []
+    for score, doc in heapq.nlargest(k, scored, key=lambda pair: pair[0]):
+        metadata = doc.get("metadata", {})
+        results.append({
+            "content": doc.get("content", ""),
+            "metadata": metadata,
+            "score": score,
+            "doc_id": metadata.get("doc_id", ""),
+            "standard": metadata.get("standard", ""),
+            "section": metadata.get("section", ""),
+            "paragraph": metadata.get("paragraph", ""),
+            "page_from": metadata.get("page_from", 0),
+            "page_to": metadata.get("page_to", 0),
+            "document_id": metadata.get("document_id", metadata.get("doc_id", "")),
+            "chunk_id": metadata.get("chunk_id", "")
+        })
+    
+    return results
+
+
 def _calculate_relevance_score(query: str, content: str) -> float:
     """Calculate relevance score between query and content.
     
@@ -91,10 +195,13 @@ def _calculate_relevance_score(query: str, content: str) -> float:
         Relevance score between 0 and 1
     """
     content_lower = content.lower()
-    
+    return _score_prepared(query, content_lower, set(content_lower.split()))
+
+
+def _score_prepared(query: str, content_lower: str, content_words: Set[str]) -> float:
+    """Relevance score for content that has already been lowercased and split."""
     # Simple keyword matching with weights
     query_words = set(query.split())
-    content_words = set(content_lower.split())
     
     # Calculate word overlap
     common_words = query_words.intersection(content_words)
@@ -2,10 +2,25 @@
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from app.models.documents import Chunk
 from app.settings import settings
 
+# doc_id -> chunks index per collection file, rebuilt when the file changes.
+# Writes in this process also bump the generation, so they invalidate the
+# index even when the file's mtime and size come out unchanged.
+_doc_index_cache: Dict[str, Tuple[tuple, Dict[str, List[Dict[str, Any]]]]] = {}
+_doc_index_lock = threading.Lock()
+_collection_generation = 0
+
+
+def _bump_generation() -> None:
+    """Invalidate cached document indexes after a write."""
+    global _collection_generation
+    with _doc_index_lock:
+        _collection_generation += 1
+
 
 def get_vector_store(persist_directory: Optional[str] = None):
     """Get or create simple file-based vector store.
@@ -111,6 +126,7 @@ def upsert_chunks(chunks: List[Chunk], collection_name: str = "ifrs_documents")
         collection_file = os.path.join(client["path"], f"{collection_name}.json")
         with open(collection_file, 'w') as f:
             json.dump(collection, f, indent=2)
+        _bump_generation()
         
         return len(chunks)
     
@@ -159,6 +175,60 @@ def search_similar(
         raise Exception(f"Error searching vector store: {e}")
 
 
+def get_collection_version(collection_name: str = "ifrs_documents") -> tuple:
+    """Get a token that changes whenever the collection's contents may have.
+    
+    Args:
+        collection_name: Name of the collection
+        
+    Returns:
+        Opaque, comparable version of the collection file
+    """
+    collection_file = os.path.join(settings.VECTOR_DIR, f"{collection_name}.json")
+    with _doc_index_lock:
+        generation = _collection_generation
+    try:
+        stat = os.stat(collection_file)
+    except OSError:
+        return (collection_file, None, None, generation)
+    return (collection_file, stat.st_mtime_ns, stat.st_size, generation)
+
+
+def get_document_chunks(doc_id: str, collection_name: str = "ifrs_documents") -> List[Dict[str, Any]]:
+    """Get all chunks of a document, in stored order.
+    
+    Chunks are looked up in a doc_id index that is built once per version of
+    the collection file, instead of scanning the whole collection per call.
+    
+    Args:
+        doc_id: Document identifier
+        collection_name: Name of the collection
+        
+    Returns:
+        List of chunk documents with content and metadata
+    """
+    client = get_vector_store()
+    version = get_collection_version(collection_name)
+    collection_file = version[0]
+    
+    if version[1] is None:
+        return []
+    
+    with _doc_index_lock:
+        cached = _doc_index_cache.get(collection_file)
+    
+    if cached is None or cached[0] != version:
+        collection = get_collection(client, collection_name)
+        index: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in collection.get("documents", []):
+            index.setdefault(doc.get("metadata", {}).get("doc_id"), []).append(doc)
+        cached = (version, index)
+        with _doc_index_lock:
+            _doc_index_cache[collection_file] = cached
+    
+    return list(cached[1].get(doc_id, ()))
+
+
 def get_collection_count(collection_name: str = "ifrs_documents") -> int:
     """Get the number of documents in the collection.
     
@@ -212,6 +282,7 @@ def delete_document(doc_id: str, collection_name: str = "ifrs_documents") -> boo
         collection_file = os.path.join(client["path"], f"{collection_name}.json")
         with open(collection_file, 'w') as f:
             json.dump(collection, f, indent=2)
+        _bump_generation()
         
         return len(collection["documents"]) < original_count
     
@@ -1,16 +1,20 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter, Depends
-from app.settings import Settings, get_settings
+from fastapi import APIRouter
+from app.settings import get_settings
 
 router = APIRouter()
 
+# Settings are a process-wide singleton, so the body never changes after import
+_settings = get_settings()
+_HEALTHZ = {
+    "ok": True,
+    "service": _settings.API_NAME,
+    "environment": _settings.ENVIRONMENT
+}
+
 
 @router.get("/healthz")
-async def health_check(settings: Settings = Depends(get_settings)) -> dict:
+async def health_check() -> dict:
     """Health check endpoint."""
-    return {
-        "ok": True,
-        "service": settings.API_NAME,
-        "environment": settings.ENVIRONMENT
-    }
+    return _HEALTHZ
@@ -11,6 +11,12 @@ from pathlib import Path
 
 from app.deps import require_api_key
 
+# Prefer libyaml's C loader; PyYAML builds without it use the Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 router = APIRouter(prefix="/policy", tags=["policy"])
 
 # Runtime policy overrides (in-memory for PoC)
@@ -43,8 +49,8 @@ def load_policy_file() -> Dict[str, Any]:
         }
     
     try:
-        with open(policy_file, 'r') as f:
-            return yaml.safe_load(f)
+        with open(policy_file, 'rb') as f:
+            return yaml.load(f, Loader=_YamlLoader)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load policy file: {str(e)}")
 
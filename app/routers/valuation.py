@@ -10,6 +10,7 @@ import logging
 
 from app.database.crud import valuation_runs, curves, audit
 from app.database.models import ValuationRun, IRSSpec, CCSSpec, PVBreakdown
+from app.utils.clock import request_now
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/valuation", tags=["valuation"])
@@ -35,8 +36,8 @@ async def create_valuation_run(
             "market_data_profile": market_data_profile,
             "status": "pending",
             "created_by": user_id,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": request_now(),
+            "updated_at": request_now()
         }
         
         # Save to database
@@ -86,11 +87,15 @@ async def get_valuation_run(run_id: str):
 async def list_valuation_runs(
     limit: int = 100,
     skip: int = 0,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    full: bool = False
 ):
-    """List valuation runs."""
+    """List valuation runs; summary fields only unless full is set."""
     try:
-        runs = await valuation_runs.list_runs(limit=limit, skip=skip)
+        if full:
+            runs = await valuation_runs.list_runs_full(limit=limit, skip=skip)
+        else:
+            runs = await valuation_runs.list_runs_summary(limit=limit, skip=skip)
         
         # Filter by status if provided
         if status:
@@ -117,7 +122,7 @@ async def update_run_status(
     try:
         update_data = {
             "status": status,
-            "updated_at": datetime.utcnow()
+            "updated_at": request_now()
         }
         
         if result:
@@ -173,8 +178,8 @@ async def create_curve(
             "status": "active",
             "version": "1.0.0",
             "created_by": user_id,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "created_at": request_now(),
+            "updated_at": request_now()
         }
         
         await curves.create_curve(curve_data)
@@ -203,11 +208,15 @@ async def create_curve(
 @router.get("/curves", response_model=List[dict])
 async def list_curves(
     currency: Optional[str] = None,
-    curve_type: Optional[str] = None
+    curve_type: Optional[str] = None,
+    full: bool = False
 ):
-    """List curves with optional filtering."""
+    """List curves with optional filtering; summary fields only unless full is set."""
     try:
-        curves_list = await curves.list_curves(currency=currency, curve_type=curve_type)
+        if full:
+            curves_list = await curves.list_curves(currency=currency, curve_type=curve_type)
+        else:
+            curves_list = await curves.list_curves_summary(currency=currency, curve_type=curve_type)
         
         # Convert ObjectIds to strings
         for curve in curves_list:
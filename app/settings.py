@@ -39,12 +39,23 @@ class Settings(BaseSettings):
     POC_ENABLE_PARSE: bool = True
     POC_ENABLE_EXPLAIN: bool = True
     
+    # IFRS Q&A
+    # Cosine similarity above which a question reuses the answer to a
+    # previously asked one; 0 disables the proximity cache
+    IFRS_SEMCACHE_TAU: float = 0.0
+    
     # Security Configuration
     API_KEY: Optional[str] = None
     
     # Database Configuration
     DATABASE_URL: Optional[str] = None
     LOG_DB: str = "sqlite:///./.run/audit.db"
+    # MongoDB connection pool
+    MONGO_MAX_POOL: int = 200
+    MONGO_MIN_POOL: int = 10
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 3000
     
     # Environment
     ENVIRONMENT: str = "development"
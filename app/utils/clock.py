@@ -0,0 +1,19 @@
+"""Per-request timestamps."""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Set once per request by RequestTimeMiddleware so every record written while
+# handling the request shares one timestamp
+REQUEST_NOW: ContextVar[Optional[datetime]] = ContextVar("request_now", default=None)
+
+
+def request_now() -> datetime:
+    """Get the current request's timestamp, or the current UTC time outside a request.
+    
+    Returns:
+        Timezone-aware UTC datetime
+    """
+    now = REQUEST_NOW.get()
+    return now if now is not None else datetime.now(timezone.utc)
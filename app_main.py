@@ -19,6 +19,8 @@ logger = logging.getLogger(__name__)
 
 # Import database and routers
 from app.database.connection import db_manager
+from app.database.crud import audit_writer
+from app.middleware.request_time import RequestTimeMiddleware
 from app.routers.valuation import router as valuation_router
 
 @asynccontextmanager
@@ -29,6 +31,8 @@ async def lifespan(app: FastAPI):
     try:
         await db_manager.connect()
         logger.info("✅ Database connected successfully")
+        await db_manager.create_indexes()
+        audit_writer.start()
     except Exception as e:
         logger.error(f"❌ Failed to connect to database: {e}")
         # Continue without database for now
@@ -37,6 +41,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Valuation Agent Backend...")
+    await audit_writer.stop()
     await db_manager.disconnect()
     logger.info("✅ Database disconnected")
 
@@ -57,6 +62,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Give every record written during a request the same timestamp
+app.add_middleware(RequestTimeMiddleware)
+
 # Include routers
 app.include_router(valuation_router)
 
@@ -66,7 +74,7 @@ async def health_check():
     """Health check endpoint."""
     try:
         # Check database connection
-        db_status = "connected" if db_manager.db else "disconnected"
+        db_status = "connected" if db_manager.connected else "disconnected"
         
         return {
             "status": "healthy",
@@ -97,7 +105,7 @@ async def test_endpoint():
     """Test endpoint."""
     return {
         "message": "API is working",
-        "database": "connected" if db_manager.db else "disconnected"
+        "database": "connected" if db_manager.connected else "disconnected"
     }
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ Minimal FastAPI app for Azure deployment - Simple version without complex valuat
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from datetime import datetime
 import os
 import json
@@ -12,8 +13,18 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 import math
 
-# Create FastAPI app
-app = FastAPI(title="Valuation Backend - Minimal Simple")
+# Try to import optional dependencies
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Create FastAPI app, serializing responses with orjson when it is installed
+app = FastAPI(
+    title="Valuation Backend - Minimal Simple",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -5,6 +5,7 @@ Ultra-minimal FastAPI app for Azure deployment
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from datetime import datetime
 import os
 import json
@@ -20,8 +21,17 @@ except ImportError:
     AIOHTTP_AVAILABLE = False
     print("WARNING: aiohttp not available - LLM features disabled")
 
-# Create FastAPI app
-app = FastAPI(title="Valuation Backend - Ultra Minimal")
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Create FastAPI app, serializing responses with orjson when it is installed
+app = FastAPI(
+    title="Valuation Backend - Ultra Minimal",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -0,0 +1,43 @@
+"""Tests for chat request parsing."""
+
+from agents.chat import ConstrainedChatAgent, POLICY_ABSTAIN_REASON
+
+
+def test_policy_refusal_is_kept_next_to_allowed_tool():
+    """A clause that trips the abstain policy is reported, not silently dropped."""
+    agent = ConstrainedChatAgent()
+    tool_calls = agent.parse_tool_requests("status and price a swaption", "run-1")
+
+    assert [tc.name for tc in tool_calls] == ["get_run_status", "abstain"]
+    assert tool_calls[1].parameters["reason"] == POLICY_ABSTAIN_REASON
+
+
+def test_unrecognized_clause_is_dropped_when_another_is_actionable():
+    agent = ConstrainedChatAgent()
+    tool_calls = agent.parse_tool_requests("status and hello", "run-1")
+
+    assert [tc.name for tc in tool_calls] == ["get_run_status"]
+
+
+def test_parse_tool_request_returns_single_call_for_whole_message():
+    agent = ConstrainedChatAgent()
+    tool_call = agent.parse_tool_request("status and price a swaption", "run-1")
+    assert tool_call.name == "abstain"
+    assert tool_call.parameters["reason"] == POLICY_ABSTAIN_REASON
+
+
+def test_cached_tool_calls_are_not_shared():
+    """Mutating a returned call does not change later parses of the same message."""
+    agent = ConstrainedChatAgent()
+    first = agent.parse_tool_request("show status", "run-1")
+    first.parameters["run_id"] = "tampered"
+    second = agent.parse_tool_request("show status", "run-1")
+    assert second.parameters["run_id"] == "run-1"
+
+
+def test_cached_tool_results_are_not_shared():
+    """Mutating a cached status result does not change later lookups."""
+    agent = ConstrainedChatAgent()
+    agent._terminal_status_cache.set("run-1", {"success": True, "data": {"status": "completed"}})
+    agent._terminal_status_cache.get("run-1")["data"]["status"] = "tampered"
+    assert agent._terminal_status_cache.get("run-1")["data"]["status"] == "completed"
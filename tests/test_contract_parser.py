@@ -0,0 +1,64 @@
+"""Tests for the contract field parser."""
+
+import json
+
+from agents.contract_parser import ContractParser, parse_contract_node
+
+
+def test_overlapping_fields_are_all_extracted():
+    """A notional match that spans the currency code must not hide the currency."""
+    parser = ContractParser()
+    extraction = parser.parse_contract(
+        "Floating leg pays SOFR rate index. Notional amount USD 50,000,000."
+    )
+    fields = {field.field_name: field.value for field in extraction.fields}
+
+    assert fields["currency"] == "usd"
+    assert fields["notional"] == 50000000.0
+    assert fields["floating_index"] == "sofr"
+    assert round(extraction.overall_confidence, 4) == 0.8333
+
+
+def test_candidates_cover_every_pattern_start():
+    """The fused scan yields the same hits as matching each pattern at every position."""
+    parser = ContractParser()
+    text = parser._clean_text(
+        "Floating leg pays SOFR rate index. Notional amount USD 50,000,000."
+    )
+    expected = [
+        (start, field_name, match.group(0))
+        for start in range(len(text) + 1)
+        for field_name, pattern in parser._flat_patterns
+        for match in [pattern.match(text, start)]
+        if match
+    ]
+    candidates = [
+        (match.start(), field_name, match.group(0))
+        for field_name, match, _ in parser._iter_candidates(text)
+    ]
+
+    assert candidates == expected
+
+
+def test_optional_fields_after_repeated_currency_mentions_are_extracted():
+    """Terms that follow many non-improving matches are still found."""
+    parser = ContractParser()
+    header = (
+        "Notional amount: USD 10,000,000. Effective date: 01/15/2024. "
+        "Maturity date: 01/15/2029."
+    )
+    body = " ".join("Amounts are payable in USD." for _ in range(60))
+    terms = "Fixed rate: 4.25%. Payment frequency: quarterly. Day count: ACT/360."
+    extraction = parser.parse_contract(f"{header} {body} {terms}")
+    fields = {field.field_name: field.value for field in extraction.fields}
+    assert fields["fixed_rate"] == 4.25
+    assert fields["frequency"] == "3M"
+    assert fields["day_count"] == "ACT/360"
+
+
+def test_parse_contract_node_returns_plain_dicts():
+    """Node output keeps its JSON-serializable dict shape."""
+    result = parse_contract_node("Notional amount USD 50,000,000.")
+    json.dumps(result)
+    assert result["fields"][0]["field_name"] == "notional"
+    assert result["fields"][0]["value"] == 50000000.0
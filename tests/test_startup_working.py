@@ -0,0 +1,39 @@
+"""Tests for the startup_working ASGI front end."""
+
+import asyncio
+import json
+
+import startup_working
+
+
+def _call(method, path, body=b""):
+    """Drive asgi_app for one request and return (status, decoded body)."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(startup_working.asgi_app(scope, receive, send))
+    payload = sent[1]["body"]
+    return sent[0]["status"], json.loads(payload) if payload else None
+
+
+def test_asgi_app_serves_every_stdlib_route():
+    """uvicorn and the stdlib server dispatch through the same tables."""
+    for path in startup_working._GET_ROUTES:
+        assert _call("GET", path)[0] == 200
+    status, body = _call("GET", "/poc/chat")
+    assert status == 200
+    assert body["status"] == "success"
+    status, body = _call("POST", "/api/valuation/runs", b'{"notional": 1}')
+    assert status == 201
+    assert body["data"] == {"notional": 1}
+
+
+def test_asgi_app_matches_stdlib_not_found():
+    assert _call("GET", "/missing") == (404, {"error": "Not found"})
+    assert _call("POST", "/missing") == (404, {"error": "Not found"})